@@ -27,7 +27,7 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     """
     logger.info("🚀 Запуск приложения...")
 
-    logger.info(f"📡 API доступен на http://{settings.api_host}:{settings.api_port}")
+    logger.info("📡 API доступен на http://{}:{}", settings.api_host, settings.api_port)
 
     yield
 
@@ -61,9 +61,9 @@ logger.info("✅ Админ-панель доступна на http://localhost:
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Middleware для логирования HTTP запросов."""
-    logger.debug(f"➡️  {request.method} {request.url.path}")
+    logger.debug("➡️  {} {}", request.method, request.url.path)
     response = await call_next(request)
-    logger.debug(f"⬅️  {request.method} {request.url.path} → {response.status_code}")
+    logger.debug("⬅️  {} {} → {}", request.method, request.url.path, response.status_code)
     return response
 
 
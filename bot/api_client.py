@@ -5,16 +5,70 @@ HTTP клиент для взаимодействия с Backend API.
 from typing import Any
 
 import httpx
+from cache import RedisCache
 from config import settings
 from loguru import logger
 
 
+def _normalize_user(user: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Привести данные пользователя к виду, ожидаемому обработчиками.
+
+    Args:
+        user: Пользователь из ответа API или None
+
+    Returns:
+        Тот же словарь с булевым is_admin или None
+    """
+    if user is not None:
+        user["is_admin"] = bool(user.get("is_admin"))
+    return user
+
+
 class APIClient:
     """Асинхронный клиент для работы с Backend API."""
 
     def __init__(self):
         self.base_url = settings.api_base_url
         self._timeout = 30.0
+        # Создаётся при первом запросе внутри общего event loop (utils.run_async)
+        # и переиспользует соединения между обновлениями
+        self._client: httpx.AsyncClient | None = None
+        # Кеш пользователей по Telegram ID, включается при заданном REDIS_URL
+        self._user_cache = (
+            RedisCache(settings.redis_url, prefix="user:tg:", ttl=settings.user_cache_ttl)
+            if settings.redis_url
+            else None
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Получить HTTP клиент, создав его при первом обращении.
+
+        Returns:
+            Общий httpx.AsyncClient
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._client
+
+    async def check_health(self) -> int:
+        """
+        Запросить /health Backend API через общий клиент.
+
+        Returns:
+            HTTP статус ответа
+
+        Raises:
+            httpx.HTTPError: Ошибка подключения или таймаут
+        """
+        url = f"{self.base_url.replace('/api/v1', '')}/health"
+        response = await self._get_client().get(url, timeout=5.0)
+        return response.status_code
 
     async def _request(
         self,
@@ -25,8 +79,8 @@ class APIClient:
         """
         Выполнить HTTP запрос к API.
 
-        Создаёт новый httpx.AsyncClient для каждого запроса, чтобы избежать
-        проблем с закрытым event loop при использовании asyncio.run().
+        Все запросы идут через один httpx.AsyncClient, привязанный к общему
+        event loop бота, поэтому соединения с API не открываются заново.
 
         Args:
             method: HTTP метод (GET, POST, PATCH, DELETE)
@@ -43,28 +97,38 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            async with httpx.AsyncClient(
-                timeout=self._timeout,
-                follow_redirects=True,
-            ) as client:
-                response = await client.request(method, url, **kwargs)
-                response.raise_for_status()
+            response = await self._get_client().request(method, url, **kwargs)
+            response.raise_for_status()
 
-                if response.status_code == 204:
-                    return None
-                return response.json()
+            if response.status_code == 204:
+                return None
+            return response.json()
         except httpx.ConnectError as e:
-            logger.error(f"Ошибка подключения к API {url}: {e}")
+            logger.error("Ошибка подключения к API {}: {}", url, e)
             raise
         except httpx.TimeoutException as e:
-            logger.error(f"Таймаут при запросе к API {url}: {e}")
+            logger.error("Таймаут при запросе к API {}: {}", url, e)
             raise
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP ошибка {e.response.status_code} для {url}: {e.response.text}")
+            logger.error("HTTP ошибка {} для {}: {}", e.response.status_code, url, e.response.text)
             raise
 
     # --- Users ---
 
+    async def _cache_user(self, user: dict[str, Any] | None) -> dict[str, Any] | None:
+        """
+        Сохранить актуальные данные пользователя в кеш.
+
+        Args:
+            user: Пользователь из ответа API или None
+
+        Returns:
+            Тот же пользователь
+        """
+        if user is not None and self._user_cache is not None:
+            await self._user_cache.set(user["telegram_id"], user)
+        return user
+
     async def get_or_create_user(
         self,
         telegram_id: int,
@@ -90,7 +154,7 @@ class APIClient:
         Returns:
             Данные пользователя
         """
-        return await self._request(
+        user = await self._request(
             "POST",
             "/users/get-or-create",
             json={
@@ -103,6 +167,7 @@ class APIClient:
                 "sports": sports,
             },
         )
+        return await self._cache_user(_normalize_user(user))
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> dict[str, Any] | None:
         """
@@ -114,12 +179,17 @@ class APIClient:
         Returns:
             Данные пользователя или None
         """
+        if self._user_cache is not None:
+            user = await self._user_cache.get(telegram_id)
+            if user is not None:
+                return user
         try:
-            return await self._request("GET", f"/users/telegram/{telegram_id}")
+            user = _normalize_user(await self._request("GET", f"/users/telegram/{telegram_id}"))
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
             raise
+        return await self._cache_user(user)
 
     async def get_user_by_id(self, user_id: int) -> dict[str, Any] | None:
         """
@@ -132,7 +202,7 @@ class APIClient:
             Данные пользователя или None
         """
         try:
-            return await self._request("GET", f"/users/{user_id}")
+            return _normalize_user(await self._request("GET", f"/users/{user_id}"))
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -149,7 +219,8 @@ class APIClient:
         Returns:
             Обновлённые данные пользователя
         """
-        return await self._request("PATCH", f"/users/{user_id}", json=kwargs)
+        user = _normalize_user(await self._request("PATCH", f"/users/{user_id}", json=kwargs))
+        return await self._cache_user(user)
 
     # --- Admin ---
 
@@ -583,8 +654,12 @@ class APIClient:
         )
 
     async def close(self):
-        """Закрыть соединение (no-op, клиент создаётся на каждый запрос)."""
-        pass
+        """Закрыть соединения с API и кешем."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._user_cache is not None:
+            await self._user_cache.close()
 
 
 # Глобальный экземпляр клиента
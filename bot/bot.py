@@ -2,16 +2,105 @@
 Инициализация Telegram бота.
 """
 
+import redis
 import telebot
 from config import settings
+from dispatch import ChatOrderedExecutor, get_chat_key
+from loguru import logger
+from ratelimit import MAX_RETRY_AFTER, send_limiter
+from storage import MemoryStateStorage, RedisStateStorage
 from telebot import apihelper
-from telebot.storage import StateMemoryStorage
+from telebot.apihelper import ApiTelegramException
 
 # Включаем middleware (необходимо до создания экземпляра бота)
 apihelper.ENABLE_MIDDLEWARE = True
 
-# Создаём хранилище состояний
-state_storage = StateMemoryStorage()
+# Создаём хранилище состояний: Redis позволяет запускать несколько экземпляров бота
+if settings.redis_url:
+    # Один пул на все потоки; при нехватке соединений поток ждёт, а не падает
+    redis_pool = redis.BlockingConnectionPool.from_url(
+        settings.redis_url, max_connections=settings.redis_max_connections
+    )
+    state_storage = RedisStateStorage(connection_pool=redis_pool, prefix="fsm")
+else:
+    state_storage = MemoryStateStorage()
+
+
+class Bot(telebot.TeleBot):
+    """
+    TeleBot, обрабатывающий обновления разных чатов параллельно.
+
+    Обновления одного чата выполняются по порядку, поэтому шаги диалога
+    не обгоняют друг друга. Отправка и редактирование сообщений проходят
+    через send_limiter, чтобы не превышать лимиты Telegram, а после
+    ответа 429 чат ставится на паузу на время retry_after.
+    """
+
+    def __init__(self, *args, worker_threads: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Ошибки задач, как и в пуле telebot, сначала получает exception_handler
+        self._chat_executor = ChatOrderedExecutor(worker_threads, on_error=self._handle_exception)
+
+    def _exec_task(self, task, *args, **kwargs):
+        if not self.threaded:
+            return super()._exec_task(task, *args, **kwargs)
+        key = get_chat_key(args[0]) if args else None
+        self._chat_executor.submit(key, task, *args, **kwargs)
+
+    @staticmethod
+    def _call_limited(chat_id, method, *args, **kwargs):
+        """
+        Вызвать метод API с учётом лимитов и ответа 429.
+
+        Если Telegram просит подождать не дольше MAX_RETRY_AFTER секунд,
+        чат ставится на паузу и запрос повторяется один раз.
+        """
+        send_limiter.wait(chat_id)
+        try:
+            return method(*args, **kwargs)
+        except ApiTelegramException as e:
+            retry_after = (
+                (e.result_json.get("parameters") or {}).get("retry_after")
+                if e.error_code == 429
+                else None
+            )
+            if not retry_after:
+                raise
+            logger.warning(
+                "Telegram ограничил отправку в чат {}: retry_after={}", chat_id, retry_after
+            )
+            send_limiter.pause(chat_id, retry_after)
+            if retry_after > MAX_RETRY_AFTER:
+                raise
+        send_limiter.wait(chat_id)
+        return method(*args, **kwargs)
+
+    def send_message(self, chat_id, *args, **kwargs):
+        return self._call_limited(chat_id, super().send_message, chat_id, *args, **kwargs)
+
+    def edit_message_text(self, text, chat_id=None, *args, **kwargs):
+        if chat_id is None:
+            return super().edit_message_text(text, chat_id, *args, **kwargs)
+        return self._call_limited(
+            chat_id, super().edit_message_text, text, chat_id, *args, **kwargs
+        )
+
+    def edit_message_reply_markup(self, chat_id=None, *args, **kwargs):
+        if chat_id is None:
+            return super().edit_message_reply_markup(chat_id, *args, **kwargs)
+        return self._call_limited(
+            chat_id, super().edit_message_reply_markup, chat_id, *args, **kwargs
+        )
+
+    def stop_bot(self):
+        super().stop_bot()
+        self._chat_executor.shutdown()
+
 
 # Создаём экземпляр бота
-bot = telebot.TeleBot(settings.bot_token, parse_mode="HTML", state_storage=state_storage)
+bot = Bot(
+    settings.bot_token,
+    parse_mode="HTML",
+    state_storage=state_storage,
+    worker_threads=settings.worker_threads,
+)
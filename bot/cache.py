@@ -0,0 +1,137 @@
+"""
+Кеши для данных из API: в памяти процесса и в Redis.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+class TTLCache:
+    """
+    Потокобезопасный кеш с ограниченным временем жизни записей.
+
+    При превышении maxsize вытесняются самые старые записи.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize: Максимальное число записей
+            ttl: Время жизни записи в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Получить значение, если запись ещё не устарела.
+
+        Args:
+            key: Ключ
+            default: Значение, если записи нет или она устарела
+
+        Returns:
+            Закешированное значение или default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохранить значение.
+
+        Args:
+            key: Ключ
+            value: Значение
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Удалить запись, если она есть.
+
+        Args:
+            key: Ключ
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Кеш JSON-значений в Redis, общий для всех экземпляров бота.
+
+    Ошибки Redis не прерывают обработку: чтение возвращает None,
+    и данные запрашиваются из API.
+    """
+
+    def __init__(self, redis_url: str, prefix: str, ttl: int):
+        """
+        Args:
+            redis_url: URL подключения к Redis
+            prefix: Префикс ключей
+            ttl: Время жизни записи в секундах
+        """
+        self._redis = Redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get(self, key: str | int) -> Any:
+        """
+        Получить значение.
+
+        Args:
+            key: Ключ без префикса
+
+        Returns:
+            Значение или None, если записи нет или Redis недоступен
+        """
+        try:
+            raw = await self._redis.get(f"{self.prefix}{key}")
+        except RedisError as e:
+            logger.warning("Ошибка чтения из Redis: {}", e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str | int, value: Any) -> None:
+        """
+        Сохранить значение.
+
+        Args:
+            key: Ключ без префикса
+            value: JSON-сериализуемое значение
+        """
+        try:
+            await self._redis.set(f"{self.prefix}{key}", json.dumps(value), ex=self.ttl)
+        except RedisError as e:
+            logger.warning("Ошибка записи в Redis: {}", e)
+
+    async def close(self) -> None:
+        """Закрыть соединения с Redis."""
+        await self._redis.aclose()
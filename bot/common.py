@@ -2,13 +2,16 @@
 Общие константы и вспомогательные функции для бота.
 """
 
+import asyncio
 from enum import StrEnum
+from functools import lru_cache
 from typing import Any
 
+import httpx
 from keyboards import get_main_menu_keyboard
 from loguru import logger
 from telebot import TeleBot
-from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, LinkPreviewOptions
 
 
 class SportType(StrEnum):
@@ -26,12 +29,24 @@ class SportType(StrEnum):
     BOXING = "Бокс"
 
 
-def get_sport_keyboard(callback_prefix: str = "sport_") -> InlineKeyboardMarkup:
+# Отключённый предпросмотр ссылок для ответов меню
+NO_LINK_PREVIEW = LinkPreviewOptions(is_disabled=True)
+
+
+@lru_cache(maxsize=8)
+def get_sport_keyboard(
+    callback_prefix: str = "sport_",
+    done_callback: str | None = None,
+) -> InlineKeyboardMarkup:
     """
     Создать клавиатуру выбора видов спорта.
 
+    Клавиатура кэшируется по аргументам, возвращаемый объект общий —
+    изменять его нельзя.
+
     Args:
         callback_prefix: Префикс для callback_data
+        done_callback: callback_data кнопки «Готово» (без кнопки, если None)
 
     Returns:
         InlineKeyboardMarkup с кнопками видов спорта
@@ -41,6 +56,8 @@ def get_sport_keyboard(callback_prefix: str = "sport_") -> InlineKeyboardMarkup:
         keyboard.add(
             InlineKeyboardButton(sport.value, callback_data=f"{callback_prefix}{sport.value}")
         )
+    if done_callback:
+        keyboard.add(InlineKeyboardButton("✅ Готово", callback_data=done_callback))
     return keyboard
 
 
@@ -64,14 +81,16 @@ async def get_user_or_error(
     """
     try:
         user = await api_client.get_user_by_telegram_id(telegram_id)
-        if not user:
-            bot.send_message(chat_id, "❌ Пользователь не найден. Используйте /start")
-            return None
-        return user
-    except Exception as e:
-        logger.error(f"Ошибка получения пользователя {telegram_id}: {e}")
-        bot.send_message(chat_id, "❌ Ошибка подключения к серверу")
+    except httpx.HTTPError as e:
+        logger.error("Ошибка получения пользователя {}: {}", telegram_id, e)
+        await asyncio.to_thread(bot.send_message, chat_id, "❌ Ошибка подключения к серверу")
+        return None
+    if not user:
+        await asyncio.to_thread(
+            bot.send_message, chat_id, "❌ Пользователь не найден. Используйте /start"
+        )
         return None
+    return user
 
 
 def format_event_text(event: dict[str, Any], include_description: bool = False) -> str:
@@ -85,25 +104,51 @@ def format_event_text(event: dict[str, Any], include_description: bool = False)
     Returns:
         Отформатированный текст
     """
-    text = f"🏋️ <b>{event['title']}</b>\n"
-    text += f"📅 {event['date'][:16]}\n"
+    return _format_event_text_cached(
+        event["title"],
+        event["date"],
+        event.get("description") if include_description else None,
+        event.get("location"),
+        event.get("sport_type"),
+        event.get("max_participants"),
+        event.get("fee"),
+    )
+
+
+@lru_cache(maxsize=2048)
+def _format_event_text_cached(
+    title: str,
+    date: str,
+    description: str | None,
+    location: str | None,
+    sport_type: str | None,
+    max_participants: int | None,
+    fee: float | None,
+) -> str:
+    """
+    Кэшируемая часть format_event_text.
+
+    Ключ кэша — сами отображаемые поля, поэтому изменённое событие
+    получает новую запись и устаревший текст не возвращается.
+    """
+    parts = [f"🏋️ <b>{title}</b>\n", f"📅 {date[:16]}\n"]
 
-    if include_description and event.get("description"):
-        text += f"📝 {event['description']}\n"
+    if description:
+        parts.append(f"📝 {description}\n")
 
-    if event.get("location"):
-        text += f"📍 {event['location']}\n"
+    if location:
+        parts.append(f"📍 {location}\n")
 
-    if event.get("sport_type"):
-        text += f"⚽ {event['sport_type']}\n"
+    if sport_type:
+        parts.append(f"⚽ {sport_type}\n")
 
-    if event.get("max_participants"):
-        text += f"👥 До {event['max_participants']} чел.\n"
+    if max_participants:
+        parts.append(f"👥 До {max_participants} чел.\n")
 
-    if event.get("fee"):
-        text += f"💰 {event['fee']} руб.\n"
+    if fee:
+        parts.append(f"💰 {fee} руб.\n")
 
-    return text
+    return "".join(parts)
 
 
 async def get_admin_or_error(
@@ -127,8 +172,8 @@ async def get_admin_or_error(
     user = await get_user_or_error(api_client, bot, telegram_id, chat_id)
     if not user:
         return None
-    if not user.get("is_admin"):
-        bot.send_message(chat_id, "❌ Доступ только для администратора.")
+    if not user["is_admin"]:
+        await asyncio.to_thread(bot.send_message, chat_id, "❌ Доступ только для администратора.")
         return None
     return user
 
@@ -142,13 +187,13 @@ async def get_main_menu_keyboard_for_user(api_client, telegram_id: int):
         telegram_id: ID пользователя в Telegram
 
     Returns:
-        ReplyKeyboardMarkup с кнопками меню
+        Клавиатура с кнопками меню
     """
     try:
         user = await api_client.get_user_by_telegram_id(telegram_id)
-    except Exception:
+    except httpx.HTTPError:
         user = None
-    is_admin = bool(user and user.get("is_admin"))
+    is_admin = bool(user and user["is_admin"])
     return get_main_menu_keyboard(is_admin=is_admin)
 
 
@@ -163,18 +208,18 @@ def format_user_info(user: dict[str, Any], include_username: bool = True) -> str
     Returns:
         Отформатированный текст
     """
-    text = f"👤 {user['first_name']}"
+    parts = [f"👤 {user['first_name']}"]
 
     if include_username and user.get("username"):
-        text += f" @{user['username']}"
+        parts.append(f" @{user['username']}")
 
     if user.get("age"):
-        text += f", {user['age']} лет"
+        parts.append(f", {user['age']} лет")
 
     if user.get("city"):
-        text += f"\n📍 {user['city']}"
+        parts.append(f"\n📍 {user['city']}")
 
-    return text
+    return "".join(parts)
 
 
 def format_application_text(
@@ -193,9 +238,11 @@ def format_application_text(
     Returns:
         Отформатированный текст заявки
     """
-    text = "<b>📝 Заявка на тренировку:</b>\n"
-    text += f"🏋️ <b>{event['title']}</b>\n\n"
-    text += format_user_info(applicant, include_username=False)
+    parts = [
+        "<b>📝 Заявка на тренировку:</b>\n",
+        f"🏋️ <b>{event['title']}</b>\n\n",
+        format_user_info(applicant, include_username=False),
+    ]
     if status:
-        text += f"\nСтатус: {status}"
-    return text
+        parts.append(f"\nСтатус: {status}")
+    return "".join(parts)
@@ -14,6 +14,25 @@ class Settings(BaseSettings):
     # Backend API
     api_base_url: str = "http://localhost:8000/api/v1"
 
+    # Redis (необязательно): состояния диалогов и кеш пользователей,
+    # общие для всех экземпляров бота
+    redis_url: str = ""
+    redis_max_connections: int = 50
+    user_cache_ttl: int = 60
+
+    # Webhook (необязательно): публичный HTTPS-адрес бота; пусто — long polling
+    webhook_url: str = ""
+    webhook_secret: str = ""
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # Потоки обработки обновлений (обновления одного чата идут по порядку)
+    worker_threads: int = 8
+
+    # Максимум корутин обработчиков, одновременно выполняющихся в общем event loop
+    # (запросы к API); ограничивает нагрузку, если значение меньше worker_threads
+    max_concurrent_handlers: int = 50
+
     # Режим отладки
     debug: bool = False
 
@@ -0,0 +1,98 @@
+"""
+Параллельная обработка обновлений с сохранением порядка внутри чата.
+"""
+
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from loguru import logger
+from telebot.types import CallbackQuery, Message
+
+
+def get_chat_key(update: Any) -> int | None:
+    """
+    Определить чат, к которому относится обновление.
+
+    Args:
+        update: Message, CallbackQuery или другое обновление
+
+    Returns:
+        ID чата или None, если порядок обработки не важен
+    """
+    if isinstance(update, Message):
+        return update.chat.id
+    if isinstance(update, CallbackQuery):
+        return update.message.chat.id if update.message else update.from_user.id
+    return None
+
+
+class ChatOrderedExecutor:
+    """
+    Пул потоков, в котором задачи одного чата выполняются строго по очереди.
+
+    Медленный обработчик задерживает только следующие обновления своего
+    чата, остальные чаты обрабатываются параллельно.
+    """
+
+    def __init__(self, max_workers: int, on_error: Callable[[Exception], bool] | None = None):
+        """
+        Args:
+            max_workers: Число потоков
+            on_error: Обработчик ошибок задач; True — ошибка обработана
+        """
+        self._on_error = on_error
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat")
+        # Ожидающие задачи по чатам; ключ есть, пока задачи чата выполняются
+        self._queues: dict[Hashable, deque[Callable[[], Any]]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable | None, fn: Callable, *args, **kwargs):
+        """
+        Поставить задачу в очередь.
+
+        Args:
+            key: Ключ очереди (ID чата) или None для задач без порядка
+            fn: Функция
+            *args: Позиционные аргументы
+            **kwargs: Именованные аргументы
+        """
+        task = partial(fn, *args, **kwargs)
+        if key is None:
+            self._pool.submit(self._run, task)
+            return
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append(task)
+                return
+            self._queues[key] = deque()
+        self._pool.submit(self._drain, key, task)
+
+    def _drain(self, key: Hashable, task: Callable[[], Any]):
+        """Выполнить задачи чата по порядку, пока очередь не опустеет."""
+        while True:
+            self._run(task)
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    return
+                task = queue.popleft()
+
+    def _run(self, task: Callable[[], Any]):
+        """Выполнить задачу, не позволяя ошибке остановить очередь."""
+        try:
+            task()
+        except Exception as e:
+            if self._on_error is not None and self._on_error(e):
+                return
+            logger.exception("Ошибка при обработке обновления")
+
+    def shutdown(self):
+        """Остановить пул после выполнения поставленных задач."""
+        self._pool.shutdown(wait=True)
@@ -1,3 +1,5 @@
+from utils import callback_router, state_router, text_router
+
 from handlers.admin import register_admin_handlers
 from handlers.applications import register_applications_handlers
 from handlers.events import register_events_handlers
@@ -15,6 +17,10 @@ def register_all_handlers(bot):
     Args:
         bot: Экземпляр TeleBot
     """
+    # Кнопки меню обрабатываются раньше обработчиков состояний
+    text_router.register(bot)
+    callback_router.register(bot)
+    state_router.register(bot)
     register_start_handlers(bot)
     register_registration_handlers(bot)
     register_profile_handlers(bot)
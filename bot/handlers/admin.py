@@ -11,7 +11,15 @@ from loguru import logger
 from states import AdminStates
 from telebot import TeleBot
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from utils import safe_callback, safe_handler
+from utils import (
+    AsyncBot,
+    get_state_data,
+    run_async,
+    safe_callback,
+    safe_handler,
+    state_router,
+    text_router,
+)
 
 
 def register_admin_handlers(bot: TeleBot):
@@ -23,6 +31,8 @@ def register_admin_handlers(bot: TeleBot):
     """
     safe = safe_handler(bot)
     safe_cb = safe_callback(bot)
+    # Вызовы Telegram из async-обработчиков не блокируют event loop
+    abot = AsyncBot(bot)
 
     def format_user_label(user: dict) -> str:
         """
@@ -86,17 +96,17 @@ def register_admin_handlers(bot: TeleBot):
 
         keyboard.add(InlineKeyboardButton("❌ Отмена", callback_data="adm_user_cancel"))
 
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             "Выберите пользователя для личного сообщения:",
             reply_markup=keyboard,
         )
 
-    @bot.message_handler(func=lambda m: m.text == "Администрирование")
+    @text_router.route("Администрирование")
     @safe
     def admin_menu(message: Message):
         """Показать админ-меню."""
-        asyncio.run(_admin_menu_async(message))
+        run_async(_admin_menu_async(message))
 
     async def _admin_menu_async(message: Message):
         """Async реализация admin_menu."""
@@ -108,17 +118,17 @@ def register_admin_handlers(bot: TeleBot):
         )
         if not admin_user:
             return
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             "🛠 Администрирование\nВыберите действие:",
             reply_markup=get_admin_menu_keyboard(),
         )
 
-    @bot.message_handler(func=lambda m: m.text == "⬅️ Назад")
+    @text_router.route("⬅️ Назад")
     @safe
     def admin_back(message: Message):
         """Вернуться в главное меню из админ-меню."""
-        asyncio.run(_admin_back_async(message))
+        run_async(_admin_back_async(message))
 
     async def _admin_back_async(message: Message):
         """Async реализация admin_back."""
@@ -130,17 +140,17 @@ def register_admin_handlers(bot: TeleBot):
         )
         if not admin_user:
             return
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             "Выберите действие:",
             reply_markup=get_main_menu_keyboard(is_admin=True),
         )
 
-    @bot.message_handler(func=lambda m: m.text == "📣 Рассылка всем")
+    @text_router.route("📣 Рассылка всем")
     @safe
     def start_broadcast(message: Message):
         """Начать создание рассылки."""
-        asyncio.run(_start_broadcast_async(message))
+        run_async(_start_broadcast_async(message))
 
     async def _start_broadcast_async(message: Message):
         """Async реализация start_broadcast."""
@@ -152,18 +162,20 @@ def register_admin_handlers(bot: TeleBot):
         )
         if not admin_user:
             return
-        bot.set_state(message.from_user.id, AdminStates.waiting_broadcast_text, message.chat.id)
-        bot.send_message(
+        await abot.set_state(
+            message.from_user.id, AdminStates.waiting_broadcast_text, message.chat.id
+        )
+        await abot.send_message(
             message.chat.id,
             "Введите текст рассылки:\n\n💡 Используйте /cancel для отмены",
             reply_markup=get_admin_menu_keyboard(),
         )
 
-    @bot.message_handler(func=lambda m: m.text == "✉️ Личное сообщение")
+    @text_router.route("✉️ Личное сообщение")
     @safe
     def start_personal_message(message: Message):
         """Начать отправку личного сообщения."""
-        asyncio.run(_start_personal_message_async(message))
+        run_async(_start_personal_message_async(message))
 
     async def _start_personal_message_async(message: Message):
         """Async реализация start_personal_message."""
@@ -176,7 +188,9 @@ def register_admin_handlers(bot: TeleBot):
         if not admin_user:
             return
 
-        bot.set_state(message.from_user.id, AdminStates.waiting_personal_select, message.chat.id)
+        await abot.set_state(
+            message.from_user.id, AdminStates.waiting_personal_select, message.chat.id
+        )
         await send_user_page(message, page=0)
 
     @bot.callback_query_handler(
@@ -201,7 +215,7 @@ def register_admin_handlers(bot: TeleBot):
         if call.data.startswith("adm_user_page_"):
             page = int(call.data.replace("adm_user_page_", ""))
             bot.answer_callback_query(call.id, "✅")
-            asyncio.run(send_user_page(call.message, page=page))
+            run_async(send_user_page(call.message, page=page))
             return
 
         _, _, user_id_str, telegram_id_str = call.data.split("_", 3)
@@ -217,12 +231,10 @@ def register_admin_handlers(bot: TeleBot):
             reply_markup=get_admin_menu_keyboard(),
         )
 
-    @bot.message_handler(state=AdminStates.waiting_personal_text, content_types=["text"])
+    @state_router.route(AdminStates.waiting_personal_text)
     @safe
     def process_personal_text(message: Message):
         """Обработка текста личного сообщения."""
-        if message.text and message.text.startswith("/"):
-            return
         text = (message.text or "").strip()
         if not text:
             bot.send_message(message.chat.id, "❌ Введите текст сообщения")
@@ -261,7 +273,7 @@ def register_admin_handlers(bot: TeleBot):
             return
 
         bot.answer_callback_query(call.id, "⏳ Отправка...")
-        asyncio.run(_send_personal_message_async(call))
+        run_async(_send_personal_message_async(call))
 
     async def _send_personal_message_async(call):
         """Async реализация отправки личного сообщения."""
@@ -274,34 +286,34 @@ def register_admin_handlers(bot: TeleBot):
         if not admin_user:
             return
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            text = data.get("personal_text")
-            telegram_id = data.get("target_telegram_id")
+        data = await asyncio.to_thread(get_state_data, bot, call.from_user.id, call.message.chat.id)
+        text = data.get("personal_text")
+        telegram_id = data.get("target_telegram_id")
 
         if not text or not telegram_id:
-            bot.send_message(call.message.chat.id, "❌ Данные для отправки не найдены.")
+            await abot.send_message(call.message.chat.id, "❌ Данные для отправки не найдены.")
             return
 
         try:
-            bot.send_message(telegram_id, text)
+            await abot.send_message(telegram_id, text)
             result_text = "✅ Сообщение отправлено."
         except Exception as e:
-            logger.error(f"Не удалось отправить личное сообщение пользователю {telegram_id}: {e}")
+            logger.error(
+                "Не удалось отправить личное сообщение пользователю {}: {}", telegram_id, e
+            )
             result_text = "❌ Не удалось отправить сообщение."
 
-        bot.delete_state(call.from_user.id, call.message.chat.id)
-        bot.send_message(
+        await abot.delete_state(call.from_user.id, call.message.chat.id)
+        await abot.send_message(
             call.message.chat.id,
             result_text,
             reply_markup=get_admin_menu_keyboard(),
         )
 
-    @bot.message_handler(state=AdminStates.waiting_broadcast_text, content_types=["text"])
+    @state_router.route(AdminStates.waiting_broadcast_text)
     @safe
     def process_broadcast_text(message: Message):
         """Обработка текста рассылки."""
-        if message.text and message.text.startswith("/"):
-            return
         text = (message.text or "").strip()
         if not text:
             bot.send_message(message.chat.id, "❌ Введите текст рассылки")
@@ -340,7 +352,7 @@ def register_admin_handlers(bot: TeleBot):
             return
 
         bot.answer_callback_query(call.id, "⏳ Отправка...")
-        asyncio.run(_send_broadcast_async(call))
+        run_async(_send_broadcast_async(call))
 
     async def _send_broadcast_async(call):
         """Async реализация отправки рассылки."""
@@ -353,16 +365,16 @@ def register_admin_handlers(bot: TeleBot):
         if not admin_user:
             return
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            text = data.get("broadcast_text")
+        data = await asyncio.to_thread(get_state_data, bot, call.from_user.id, call.message.chat.id)
+        text = data.get("broadcast_text")
 
         if not text:
-            bot.send_message(call.message.chat.id, "❌ Текст рассылки не найден.")
+            await abot.send_message(call.message.chat.id, "❌ Текст рассылки не найден.")
             return
 
         broadcast = await api_client.create_broadcast(admin_user["telegram_id"], text)
         broadcast_id = broadcast["id"]
-        logger.info(f"📣 Старт рассылки {broadcast_id} от @{call.from_user.username}")
+        logger.info("📣 Старт рассылки {} от @{}", broadcast_id, call.from_user.username)
 
         total_count = 0
         success_count = 0
@@ -384,11 +396,13 @@ def register_admin_handlers(bot: TeleBot):
                     fail_count += 1
                     continue
                 try:
-                    bot.send_message(telegram_id, text)
+                    await abot.send_message(telegram_id, text)
                     success_count += 1
                 except Exception as e:
                     fail_count += 1
-                    logger.error(f"Не удалось отправить рассылку пользователю {telegram_id}: {e}")
+                    logger.error(
+                        "Не удалось отправить рассылку пользователю {}: {}", telegram_id, e
+                    )
 
             skip += limit
 
@@ -400,8 +414,8 @@ def register_admin_handlers(bot: TeleBot):
             fail_count=fail_count,
         )
 
-        bot.delete_state(call.from_user.id, call.message.chat.id)
-        bot.send_message(
+        await abot.delete_state(call.from_user.id, call.message.chat.id)
+        await abot.send_message(
             call.message.chat.id,
             "✅ Рассылка завершена.\n"
             f"Всего: {total_count}\n"
@@ -2,15 +2,13 @@
 Обработчики для работы с заявками на участие.
 """
 
-import asyncio
-
 from api_client import api_client
 from common import format_application_text, format_event_text, format_user_info
 from keyboards import get_main_menu_keyboard
 from loguru import logger
 from telebot import TeleBot
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from utils import safe_callback, safe_handler
+from utils import AsyncBot, run_async, safe_callback, safe_handler, text_router
 
 
 def register_applications_handlers(bot: TeleBot):
@@ -22,29 +20,33 @@ def register_applications_handlers(bot: TeleBot):
     """
     safe = safe_handler(bot)
     safe_cb = safe_callback(bot)
+    # Вызовы Telegram из async-обработчиков не блокируют event loop
+    abot = AsyncBot(bot)
 
     @bot.message_handler(commands=["applications"])
-    @bot.message_handler(func=lambda m: m.text == "📝 Заявки")
+    @text_router.route("📝 Заявки")
     @safe
     def cmd_applications(message: Message):
         """Показать заявки на мои события."""
-        asyncio.run(_cmd_applications_async(message))
+        run_async(_cmd_applications_async(message))
 
     async def _cmd_applications_async(message: Message):
         """Async реализация cmd_applications."""
-        logger.info(f"📝 Заявки от @{message.from_user.username or message.from_user.id}")
+        logger.info("📝 Заявки от @{}", message.from_user.username or message.from_user.id)
 
         user = await api_client.get_user_by_telegram_id(message.from_user.id)
         if not user:
-            bot.send_message(message.chat.id, "❌ Пользователь не найден. Используйте /start")
+            await abot.send_message(
+                message.chat.id, "❌ Пользователь не найден. Используйте /start"
+            )
             return
 
         created_events = await api_client.get_created_events(user["id"])
         if not created_events:
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "📭 У вас пока нет созданных тренировок.",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
             )
             return
 
@@ -82,39 +84,39 @@ def register_applications_handlers(bot: TeleBot):
                         InlineKeyboardButton("✅ Одобрить", callback_data=f"approve_{app['id']}"),
                         InlineKeyboardButton("❌ Отклонить", callback_data=f"reject_{app['id']}"),
                     )
-                bot.send_message(message.chat.id, text, reply_markup=keyboard)
+                await abot.send_message(message.chat.id, text, reply_markup=keyboard)
 
         if not has_applications:
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "✅ Нет новых заявок на ваши тренировки.",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
             )
 
     @bot.callback_query_handler(func=lambda call: call.data.startswith("approve_"))
     @safe_cb
     def approve_application(call):
         """Одобрить заявку."""
-        asyncio.run(_approve_application_async(call))
+        run_async(_approve_application_async(call))
 
     async def _approve_application_async(call):
         """Async реализация approve_application."""
         application_id = int(call.data.replace("approve_", ""))
-        logger.info(f"✅ Одобрение заявки {application_id}")
+        logger.info("✅ Одобрение заявки {}", application_id)
 
         application = await api_client.review_application(application_id, "approved")
         event = await api_client.get_event(application["event_id"])
         applicant = await api_client.get_user_by_id(application["user_id"])
 
-        bot.answer_callback_query(call.id, "✅ Заявка одобрена!")
-        bot.send_message(
+        await abot.answer_callback_query(call.id, "✅ Заявка одобрена!")
+        await abot.send_message(
             call.message.chat.id,
             f"✅ Заявка от {applicant['first_name']} одобрена!\nСобытие: {event['title']}",
         )
 
         # Убираем кнопки
         try:
-            bot.edit_message_reply_markup(
+            await abot.edit_message_reply_markup(
                 call.message.chat.id, call.message.message_id, reply_markup=None
             )
         except Exception:
@@ -130,29 +132,29 @@ def register_applications_handlers(bot: TeleBot):
                 f"{format_user_info(creator)}"
             )
             try:
-                bot.send_message(applicant["telegram_id"], contact_text)
+                await abot.send_message(applicant["telegram_id"], contact_text)
             except Exception as e:
-                logger.error(f"Не удалось уведомить участника: {e}")
+                logger.error("Не удалось уведомить участника: {}", e)
 
     @bot.callback_query_handler(func=lambda call: call.data.startswith("reject_"))
     @safe_cb
     def reject_application(call):
         """Отклонить заявку."""
-        asyncio.run(_reject_application_async(call))
+        run_async(_reject_application_async(call))
 
     async def _reject_application_async(call):
         """Async реализация reject_application."""
         application_id = int(call.data.replace("reject_", ""))
-        logger.info(f"❌ Отклонение заявки {application_id}")
+        logger.info("❌ Отклонение заявки {}", application_id)
 
         application = await api_client.review_application(application_id, "rejected")
         applicant = await api_client.get_user_by_id(application["user_id"])
 
-        bot.answer_callback_query(call.id, "❌ Заявка отклонена")
+        await abot.answer_callback_query(call.id, "❌ Заявка отклонена")
 
         # Убираем кнопки
         try:
-            bot.edit_message_reply_markup(
+            await abot.edit_message_reply_markup(
                 call.message.chat.id, call.message.message_id, reply_markup=None
             )
         except Exception:
@@ -161,8 +163,8 @@ def register_applications_handlers(bot: TeleBot):
         # Уведомляем участника
         if applicant and applicant.get("telegram_id"):
             try:
-                bot.send_message(
+                await abot.send_message(
                     applicant["telegram_id"], "❌ К сожалению, ваша заявка была отклонена."
                 )
             except Exception as e:
-                logger.error(f"Не удалось уведомить участника: {e}")
+                logger.error("Не удалось уведомить участника: {}", e)
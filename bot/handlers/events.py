@@ -3,16 +3,73 @@
 """
 
 import asyncio
+import re
 from datetime import datetime
 
 from api_client import api_client
-from common import format_event_text, format_user_info, get_sport_keyboard
+from cache import TTLCache
+from common import (
+    NO_LINK_PREVIEW,
+    format_event_text,
+    format_user_info,
+    get_sport_keyboard,
+)
 from keyboards import get_main_menu_keyboard
 from loguru import logger
 from states import EventCreationStates
 from telebot import TeleBot
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from utils import safe_callback, safe_handler
+from utils import (
+    AsyncBot,
+    get_state_data,
+    run_async,
+    safe_callback,
+    safe_handler,
+    set_state_with_data,
+    state_router,
+    text_router,
+)
+
+# Сумма взноса: целое число или дробь через точку/запятую; разрядность
+# как у колонки Numeric(10, 2) в API — до 8 цифр до запятой и 2 после
+_FEE_RE = re.compile(r"^\s*(\d{1,8})(?:[.,](\d{1,2}))?\s*$")
+# Результаты поиска по (ID пользователя, date_from) для повторных нажатий кнопки
+_search_cache = TTLCache(maxsize=10_000, ttl=10)
+# Дата и время в формате ДД.ММ.ГГГГ ЧЧ:ММ
+_EVENT_DATE_RE = re.compile(r"^(\d{1,2})\.(\d{1,2})\.(\d{4}) (\d{1,2}):(\d{2})$")
+
+
+def _parse_event_datetime(value: str) -> datetime | None:
+    """
+    Разобрать дату события формата ДД.ММ.ГГГГ ЧЧ:ММ.
+
+    Args:
+        value: Текст от пользователя
+
+    Returns:
+        datetime или None, если формат или дата некорректны
+    """
+    match = _EVENT_DATE_RE.match(value)
+    if not match:
+        return None
+    day, month, year, hour, minute = map(int, match.groups())
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None
+
+
+def _search_date_from() -> str:
+    """
+    Нижняя граница поиска тренировок, округлённая до минуты.
+
+    Одинаковое значение в пределах минуты позволяет кешировать
+    ответы поиска для всех пользователей.
+
+    Returns:
+        Дата в формате ISO
+    """
+    return datetime.now().replace(second=0, microsecond=0).isoformat()
 
 
 def register_events_handlers(bot: TeleBot):
@@ -25,54 +82,61 @@ def register_events_handlers(bot: TeleBot):
     # Создаём декораторы для безопасной обработки ошибок
     safe = safe_handler(bot)
     safe_cb = safe_callback(bot)
+    # Вызовы Telegram из async-обработчиков не блокируют event loop
+    abot = AsyncBot(bot)
 
-    @bot.message_handler(func=lambda m: m.text == "➕ Создать тренировку")
+    @text_router.route("➕ Создать тренировку")
     @safe
     def create_event_start(message: Message):
         """Начать создание события."""
-        asyncio.run(_create_event_start_async(message))
+        run_async(_create_event_start_async(message))
 
     async def _create_event_start_async(message: Message):
         """Async реализация create_event_start."""
         logger.info(
-            f"➕ Создание тренировки от @{message.from_user.username or message.from_user.id}"
+            "➕ Создание тренировки от @{}", message.from_user.username or message.from_user.id
         )
 
         user = await api_client.get_user_by_telegram_id(message.from_user.id)
         if not user:
-            bot.send_message(message.chat.id, "❌ Пользователь не найден. Используйте /start")
+            await abot.send_message(
+                message.chat.id, "❌ Пользователь не найден. Используйте /start"
+            )
             return
 
         if not user.get("age") or not user.get("city"):
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "⚠️ Сначала заполните профиль!\nИспользуйте /register для регистрации.",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
             )
             return
 
-        bot.set_state(message.from_user.id, EventCreationStates.waiting_title, message.chat.id)
-        bot.send_message(
+        await abot.set_state(
+            message.from_user.id, EventCreationStates.waiting_title, message.chat.id
+        )
+        await abot.send_message(
             message.chat.id,
             "📝 Создание новой тренировки\n\n"
             "Введите название тренировки:\n\n"
             "💡 Используйте /cancel для отмены",
         )
 
-    @bot.message_handler(state=EventCreationStates.waiting_title, content_types=["text"])
+    @state_router.route(EventCreationStates.waiting_title)
     @safe
     def process_event_title(message: Message):
         """Обработка названия события."""
-        if message.text and message.text.startswith("/"):
-            return
         if not message.text or len(message.text.strip()) < 3:
             bot.send_message(message.chat.id, "❌ Название должно быть не менее 3 символов")
             return
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data["title"] = message.text.strip()
-
-        bot.set_state(message.from_user.id, EventCreationStates.waiting_date, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            EventCreationStates.waiting_date,
+            title=message.text.strip(),
+        )
         bot.send_message(
             message.chat.id,
             "📅 Введите дату и время тренировки\n"
@@ -80,47 +144,41 @@ def register_events_handlers(bot: TeleBot):
             "Например: 25.12.2024 18:00",
         )
 
-    @bot.message_handler(state=EventCreationStates.waiting_date, content_types=["text"])
+    @state_router.route(EventCreationStates.waiting_date)
     @safe
     def process_event_date(message: Message):
         """Обработка даты события."""
-        if message.text and message.text.startswith("/"):
-            return
         if not message.text:
             bot.send_message(message.chat.id, "❌ Отправьте дату в формате ДД.ММ.ГГГГ ЧЧ:ММ")
             return
 
-        try:
-            date_obj = datetime.strptime(message.text.strip(), "%d.%m.%Y %H:%M")
-            if date_obj < datetime.now():
-                bot.send_message(message.chat.id, "❌ Дата не может быть в прошлом")
-                return
-
-            with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-                data["date"] = date_obj.isoformat()
-
-            bot.set_state(
-                message.from_user.id, EventCreationStates.waiting_location, message.chat.id
-            )
-            bot.send_message(
-                message.chat.id,
-                "📍 Введите место проведения тренировки\n(или отправьте геолокацию)",
-            )
-        except ValueError:
+        date_obj = _parse_event_datetime(message.text.strip())
+        if date_obj is None:
             bot.send_message(
                 message.chat.id,
                 "❌ Неверный формат даты. Используйте: ДД.ММ.ГГГГ ЧЧ:ММ\nНапример: 25.12.2024 18:00",
             )
+            return
+        if date_obj < datetime.now():
+            bot.send_message(message.chat.id, "❌ Дата не может быть в прошлом")
+            return
 
-    @bot.message_handler(
-        state=EventCreationStates.waiting_location,
-        content_types=["text", "location"],
-    )
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            EventCreationStates.waiting_location,
+            date=date_obj.isoformat(),
+        )
+        bot.send_message(
+            message.chat.id,
+            "📍 Введите место проведения тренировки\n(или отправьте геолокацию)",
+        )
+
+    @state_router.route(EventCreationStates.waiting_location, content_types=("text", "location"))
     @safe
     def process_event_location(message: Message):
         """Обработка места проведения."""
-        if message.text and message.text.startswith("/"):
-            return
         location = latitude = longitude = None
 
         if message.location:
@@ -134,10 +192,15 @@ def register_events_handlers(bot: TeleBot):
             bot.send_message(message.chat.id, "❌ Укажите место проведения")
             return
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data.update({"location": location, "latitude": latitude, "longitude": longitude})
-
-        bot.set_state(message.from_user.id, EventCreationStates.waiting_sport_type, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            EventCreationStates.waiting_sport_type,
+            location=location,
+            latitude=latitude,
+            longitude=longitude,
+        )
         bot.send_message(
             message.chat.id,
             "🏋️ Выберите вид спорта:",
@@ -153,128 +216,136 @@ def register_events_handlers(bot: TeleBot):
         """Обработка выбора вида спорта."""
         sport_type = call.data.replace("event_sport_", "")
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            data["sport_type"] = sport_type
-
-        bot.answer_callback_query(call.id, f"✅ {sport_type}")
-        bot.set_state(
-            call.from_user.id, EventCreationStates.waiting_max_participants, call.message.chat.id
+        set_state_with_data(
+            bot,
+            call.from_user.id,
+            call.message.chat.id,
+            EventCreationStates.waiting_max_participants,
+            sport_type=sport_type,
         )
+        bot.answer_callback_query(call.id, f"✅ {sport_type}")
         bot.send_message(
             call.message.chat.id,
             "👥 Сколько человек нужно?\n(отправьте число или '0' если без ограничений)",
         )
 
-    @bot.message_handler(
-        state=EventCreationStates.waiting_max_participants,
-        content_types=["text"],
-    )
+    @state_router.route(EventCreationStates.waiting_max_participants)
     @safe
     def process_event_max_participants(message: Message):
         """Обработка количества участников."""
-        if message.text and message.text.startswith("/"):
-            return
-        try:
-            max_participants = int(message.text)
-            max_participants = None if max_participants <= 0 else max_participants
-        except (ValueError, AttributeError):
+        text = (message.text or "").strip()
+        if not text.isdecimal():
             bot.send_message(message.chat.id, "❌ Введите число или '0' если без ограничений")
             return
+        max_participants = int(text) or None
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data["max_participants"] = max_participants
-
-        bot.set_state(message.from_user.id, EventCreationStates.waiting_fee, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            EventCreationStates.waiting_fee,
+            max_participants=max_participants,
+        )
         bot.send_message(
             message.chat.id, "💰 Есть ли взнос?\n(отправьте сумму в рублях или '0' если бесплатно)"
         )
 
-    @bot.message_handler(state=EventCreationStates.waiting_fee, content_types=["text"])
+    @state_router.route(EventCreationStates.waiting_fee)
     @safe
     def process_event_fee(message: Message):
         """Обработка взноса."""
-        if message.text and message.text.startswith("/"):
-            return
-        try:
-            fee = float(message.text.replace(",", "."))
-            fee = None if fee <= 0 else fee
-        except (ValueError, AttributeError):
+        match = _FEE_RE.match(message.text or "")
+        if not match:
             bot.send_message(message.chat.id, "❌ Введите сумму или '0' если бесплатно")
             return
+        whole, frac = match.groups()
+        fee = int(whole) + (int(frac) / 10 ** len(frac) if frac else 0)
+        fee = fee or None
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data["fee"] = fee
-
-        bot.set_state(message.from_user.id, EventCreationStates.waiting_note, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            EventCreationStates.waiting_note,
+            fee=fee,
+        )
         bot.send_message(
             message.chat.id, "📝 Добавьте примечание (опционально)\nИли отправьте 'пропустить'"
         )
 
-    @bot.message_handler(state=EventCreationStates.waiting_note, content_types=["text"])
+    @state_router.route(EventCreationStates.waiting_note)
     @safe
     def process_event_note(message: Message):
         """Обработка примечания и создание события."""
-        if message.text and message.text.startswith("/"):
-            return
-        asyncio.run(_process_event_note_async(message))
+        run_async(_process_event_note_async(message))
 
     async def _process_event_note_async(message: Message):
         """Async реализация process_event_note."""
-        note = message.text.strip() if message.text.lower() != "пропустить" else None
-
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            user = await api_client.get_user_by_telegram_id(message.from_user.id)
-            if not user:
-                bot.send_message(message.chat.id, "❌ Пользователь не найден")
-                bot.delete_state(message.from_user.id, message.chat.id)
-                return
-
-            event = await api_client.create_event(
-                title=data["title"],
-                date=data["date"],
-                creator_id=user["id"],
-                location=data.get("location"),
-                latitude=data.get("latitude"),
-                longitude=data.get("longitude"),
-                sport_type=data.get("sport_type"),
-                max_participants=data.get("max_participants"),
-                fee=data.get("fee"),
-                note=note,
-            )
+        stripped = (message.text or "").strip()
+        note = None if stripped.casefold() == "пропустить" else stripped
 
-            bot.delete_state(message.from_user.id, message.chat.id)
-            text = f"✅ Тренировка создана!\n\n{format_event_text(event)}"
-            bot.send_message(
-                message.chat.id,
-                text,
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
-            )
+        data = await asyncio.to_thread(get_state_data, bot, message.from_user.id, message.chat.id)
+        user = await api_client.get_user_by_telegram_id(message.from_user.id)
+        if not user:
+            await abot.send_message(message.chat.id, "❌ Пользователь не найден")
+            await abot.delete_state(message.from_user.id, message.chat.id)
+            return
+
+        event = await api_client.create_event(
+            title=data["title"],
+            date=data["date"],
+            creator_id=user["id"],
+            location=data.get("location"),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+            sport_type=data.get("sport_type"),
+            max_participants=data.get("max_participants"),
+            fee=data.get("fee"),
+            note=note,
+        )
+        # Новая тренировка должна сразу попадать в поиск у остальных
+        _search_cache.clear()
+
+        await abot.delete_state(message.from_user.id, message.chat.id)
+        text = f"✅ Тренировка создана!\n\n{format_event_text(event)}"
+        await abot.send_message(
+            message.chat.id,
+            text,
+            reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
+        )
 
-    @bot.message_handler(func=lambda m: m.text == "🔍 Найти тренировку")
+    @text_router.route("🔍 Найти тренировку")
     @safe
     def search_events(message: Message):
         """Поиск тренировок."""
-        asyncio.run(_search_events_async(message))
+        run_async(_search_events_async(message))
 
     async def _search_events_async(message: Message):
         """Async реализация search_events."""
-        logger.info(f"🔍 Поиск тренировок от @{message.from_user.username or message.from_user.id}")
+        logger.info(
+            "🔍 Поиск тренировок от @{}", message.from_user.username or message.from_user.id
+        )
 
         user = await api_client.get_user_by_telegram_id(message.from_user.id)
         if not user:
-            bot.send_message(message.chat.id, "❌ Пользователь не найден. Используйте /start")
+            await abot.send_message(
+                message.chat.id, "❌ Пользователь не найден. Используйте /start"
+            )
             return
 
-        events = await api_client.search_events(date_from=datetime.now().isoformat(), limit=20)
-
-        # Исключаем собственные тренировки
-        filtered_events = [e for e in events if e.get("creator_id") != user["id"]]
+        cache_key = (user["id"], _search_date_from())
+        filtered_events = _search_cache.get(cache_key)
+        if filtered_events is None:
+            events = await api_client.search_events(date_from=cache_key[1], limit=20)
+            # Исключаем собственные тренировки
+            filtered_events = [e for e in events if e.get("creator_id") != user["id"]]
+            _search_cache.set(cache_key, filtered_events)
 
         if not filtered_events:
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "📭 Пока нет доступных тренировок.",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
             )
             return
 
@@ -283,19 +354,21 @@ def register_events_handlers(bot: TeleBot):
             keyboard.add(
                 InlineKeyboardButton("📝 Подать заявку", callback_data=f"apply_{event['id']}")
             )
-            bot.send_message(message.chat.id, format_event_text(event), reply_markup=keyboard)
+            await abot.send_message(
+                message.chat.id, format_event_text(event), reply_markup=keyboard
+            )
 
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             "Выберите действие:",
-            reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+            reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
         )
 
     @bot.callback_query_handler(func=lambda call: call.data.startswith("apply_"))
     @safe_cb
     def apply_to_event(call):
         """Подать заявку на участие."""
-        asyncio.run(_apply_to_event_async(call))
+        run_async(_apply_to_event_async(call))
 
     async def _apply_to_event_async(call):
         """Async реализация apply_to_event."""
@@ -303,16 +376,16 @@ def register_events_handlers(bot: TeleBot):
 
         applicant = await api_client.get_user_by_telegram_id(call.from_user.id)
         if not applicant:
-            bot.answer_callback_query(call.id, "❌ Пользователь не найден")
+            await abot.answer_callback_query(call.id, "❌ Пользователь не найден")
             return
 
         application = await api_client.apply_to_event(event_id, applicant["id"])
         if not application:
-            bot.answer_callback_query(call.id, "❌ Не удалось подать заявку")
+            await abot.answer_callback_query(call.id, "❌ Не удалось подать заявку")
             return
 
-        bot.answer_callback_query(call.id, "✅ Заявка подана!")
-        bot.send_message(
+        await abot.answer_callback_query(call.id, "✅ Заявка подана!")
+        await abot.send_message(
             call.message.chat.id,
             "📝 Ваша заявка отправлена создателю.\nВы получите уведомление после рассмотрения.",
         )
@@ -329,49 +402,56 @@ def register_events_handlers(bot: TeleBot):
                     f"Используйте /applications для просмотра"
                 )
                 try:
-                    bot.send_message(creator["telegram_id"], notification)
+                    await abot.send_message(creator["telegram_id"], notification)
                 except Exception as e:
-                    logger.error(f"Не удалось уведомить создателя: {e}")
+                    logger.error("Не удалось уведомить создателя: {}", e)
 
-    @bot.message_handler(func=lambda m: m.text == "📋 Мои тренировки")
+    @text_router.route("📋 Мои тренировки")
     @safe
     def my_events(message: Message):
         """Показать тренировки пользователя."""
-        asyncio.run(_my_events_async(message))
+        run_async(_my_events_async(message))
 
     async def _my_events_async(message: Message):
         """Async реализация my_events."""
-        logger.info(f"📋 Мои тренировки от @{message.from_user.username or message.from_user.id}")
+        logger.info("📋 Мои тренировки от @{}", message.from_user.username or message.from_user.id)
 
         user = await api_client.get_user_by_telegram_id(message.from_user.id)
         if not user:
-            bot.send_message(message.chat.id, "❌ Пользователь не найден. Используйте /start")
+            await abot.send_message(
+                message.chat.id, "❌ Пользователь не найден. Используйте /start"
+            )
             return
 
         created = await api_client.get_created_events(user["id"])
         participated = await api_client.get_user_events(user["id"])
 
         if not created and not participated:
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "📭 У вас пока нет тренировок.\nСоздайте свою или присоединитесь к существующей!",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
+                link_preview_options=NO_LINK_PREVIEW,
+                disable_notification=True,
             )
             return
 
-        text = "<b>📋 Ваши тренировки:</b>\n\n"
+        parts = ["<b>📋 Ваши тренировки:</b>\n\n"]
         if created:
-            text += "<b>Созданные вами:</b>\n"
-            for event in created[:5]:
-                text += f"🏋️ {event['title']} - {event['date'][:16]}\n"
-            text += "\n"
+            parts.append("<b>Созданные вами:</b>\n")
+            parts.extend(f"🏋️ {event['title']} - {event['date'][:16]}\n" for event in created[:5])
+            parts.append("\n")
         if participated:
-            text += "<b>Вы участвуете:</b>\n"
-            for event in participated[:5]:
-                text += f"🏋️ {event['title']} - {event['date'][:16]}\n"
+            parts.append("<b>Вы участвуете:</b>\n")
+            parts.extend(
+                f"🏋️ {event['title']} - {event['date'][:16]}\n" for event in participated[:5]
+            )
+        text = "".join(parts)
 
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             text,
-            reply_markup=get_main_menu_keyboard(is_admin=bool(user.get("is_admin"))),
+            reply_markup=get_main_menu_keyboard(is_admin=user["is_admin"]),
+            link_preview_options=NO_LINK_PREVIEW,
+            disable_notification=True,
         )
@@ -6,12 +6,40 @@ import asyncio
 
 from api_client import api_client
 from common import get_sport_keyboard
-from keyboards import get_main_menu_keyboard
+from keyboards import FrozenMarkup, get_main_menu_keyboard
 from loguru import logger
 from states import RegistrationStates
 from telebot import TeleBot
+from telebot.apihelper import ApiTelegramException
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from utils import safe_callback, safe_handler
+from utils import (
+    AsyncBot,
+    ack_callback,
+    get_state_data,
+    run_async,
+    safe_callback,
+    safe_handler,
+    state_router,
+    toggle_state_item,
+)
+
+# Значение пола по callback_data кнопки
+_GENDER_BY_CALLBACK = {
+    "gender_male": "male",
+    "gender_female": "female",
+    "gender_other": "other",
+}
+# Префикс callback_data кнопок видов спорта
+_SPORT_PREFIX = "sport_"
+_SPORT_PREFIX_LEN = len(_SPORT_PREFIX)
+# Задержка перед обновлением сообщения с выбором видов спорта, сек
+_SPORTS_EDIT_DELAY = 0.25
+
+
+def _log_sports_edit_error(future: asyncio.Future):
+    """Залогировать ошибку фонового обновления сообщения с видами спорта."""
+    if not future.cancelled() and (e := future.exception()) is not None:
+        logger.opt(exception=e).warning("Не удалось обновить выбор видов спорта: {}", e)
 
 
 def register_registration_handlers(bot: TeleBot):
@@ -24,67 +52,61 @@ def register_registration_handlers(bot: TeleBot):
     # Создаём декораторы для безопасной обработки ошибок
     safe = safe_handler(bot)
     safe_cb = safe_callback(bot)
+    # Вызовы Telegram из async-обработчиков не блокируют event loop
+    abot = AsyncBot(bot)
 
-    def get_gender_keyboard() -> InlineKeyboardMarkup:
-        """Клавиатура выбора пола."""
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("Мужской", callback_data="gender_male"))
-        keyboard.add(InlineKeyboardButton("Женский", callback_data="gender_female"))
-        return keyboard
-
-    def get_sports_keyboard() -> InlineKeyboardMarkup:
-        """Клавиатура выбора видов спорта с кнопкой Готово."""
-        keyboard = get_sport_keyboard()
-        keyboard.add(InlineKeyboardButton("✅ Готово", callback_data="sports_done"))
-        return keyboard
+    # Клавиатуры регистрации не меняются, поэтому собираются один раз
+    gender_markup = InlineKeyboardMarkup()
+    gender_markup.add(InlineKeyboardButton("Мужской", callback_data="gender_male"))
+    gender_markup.add(InlineKeyboardButton("Женский", callback_data="gender_female"))
+    gender_keyboard = FrozenMarkup(gender_markup)
+    sports_keyboard = FrozenMarkup(get_sport_keyboard(done_callback="sports_done"))
 
     @bot.message_handler(commands=["register"])
     @safe
     def cmd_register(message: Message):
         """Начать регистрацию."""
-        asyncio.run(_cmd_register_async(message))
+        run_async(_cmd_register_async(message))
 
     async def _cmd_register_async(message: Message):
         """Async реализация cmd_register."""
-        logger.info(f"📝 Регистрация от @{message.from_user.username or message.from_user.id}")
+        logger.info("📝 Регистрация от @{}", message.from_user.username or message.from_user.id)
 
         api_user = await api_client.get_user_by_telegram_id(message.from_user.id)
         if api_user and api_user.get("age") and api_user.get("city"):
-            bot.send_message(
+            await abot.send_message(
                 message.chat.id,
                 "✅ Вы уже зарегистрированы!\nИспользуйте /profile для просмотра.",
-                reply_markup=get_main_menu_keyboard(is_admin=bool(api_user.get("is_admin"))),
+                reply_markup=get_main_menu_keyboard(is_admin=api_user["is_admin"]),
             )
             return
 
-        bot.set_state(message.from_user.id, RegistrationStates.waiting_age, message.chat.id)
-        bot.send_message(
+        await abot.set_state(message.from_user.id, RegistrationStates.waiting_age, message.chat.id)
+        await abot.send_message(
             message.chat.id,
             "📝 Давайте заполним ваш профиль!\n\n"
             "Сколько вам лет? (отправьте число)\n\n"
             "💡 Используйте /cancel для отмены",
         )
 
-    @bot.message_handler(state=RegistrationStates.waiting_age, content_types=["text"])
+    @state_router.route(RegistrationStates.waiting_age)
     @safe
     def process_age(message: Message):
         """Обработка возраста."""
-        if message.text and message.text.startswith("/"):
-            return
-        try:
-            age = int(message.text.strip())
-            if not (10 <= age <= 100):
-                bot.send_message(message.chat.id, "❌ Введите возраст от 10 до 100 лет")
-                return
-        except (ValueError, AttributeError):
+        stripped = (message.text or "").strip()
+        if not stripped.isdecimal():
             bot.send_message(message.chat.id, "❌ Введите число (ваш возраст)")
             return
+        age = int(stripped)
+        if not (10 <= age <= 100):
+            bot.send_message(message.chat.id, "❌ Введите возраст от 10 до 100 лет")
+            return
 
         with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
             data["age"] = age
 
         bot.set_state(message.from_user.id, RegistrationStates.waiting_gender, message.chat.id)
-        bot.send_message(message.chat.id, "Выберите ваш пол:", reply_markup=get_gender_keyboard())
+        bot.send_message(message.chat.id, "Выберите ваш пол:", reply_markup=gender_keyboard)
 
     @bot.callback_query_handler(
         state=RegistrationStates.waiting_gender,
@@ -93,23 +115,21 @@ def register_registration_handlers(bot: TeleBot):
     @safe_cb
     def process_gender(call):
         """Обработка выбора пола."""
-        gender = "male" if call.data == "gender_male" else "female"
+        gender = _GENDER_BY_CALLBACK.get(call.data, "other")
 
         with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
             data["gender"] = gender
 
-        bot.answer_callback_query(call.id, "✅")
+        ack_callback(bot, call.id, "✅")
         bot.set_state(call.from_user.id, RegistrationStates.waiting_city, call.message.chat.id)
         bot.send_message(
             call.message.chat.id, "В каком городе вы находитесь?\nОтправьте название города:"
         )
 
-    @bot.message_handler(state=RegistrationStates.waiting_city, content_types=["text"])
+    @state_router.route(RegistrationStates.waiting_city)
     @safe
     def process_city(message: Message):
         """Обработка города."""
-        if message.text and message.text.startswith("/"):
-            return
         if not message.text or len(message.text.strip()) < 2:
             bot.send_message(message.chat.id, "❌ Введите корректное название города")
             return
@@ -121,75 +141,120 @@ def register_registration_handlers(bot: TeleBot):
         bot.send_message(
             message.chat.id,
             "Выберите виды спорта:\n(можно выбрать несколько, затем нажмите 'Готово')",
-            reply_markup=get_sports_keyboard(),
+            reply_markup=sports_keyboard,
+        )
+
+    # Отложенные обновления сообщения с выбором видов спорта по (chat_id, message_id).
+    # Используются только из общего event loop, поэтому блокировка не нужна.
+    pending_sports_edits: dict[tuple[int, int], asyncio.TimerHandle] = {}
+
+    def schedule_sports_edit(user_id: int, chat_id: int, message_id: int):
+        """
+        Запланировать обновление сообщения с выбором видов спорта.
+
+        Быстрые нажатия подряд объединяются: сообщение редактируется
+        один раз после паузы _SPORTS_EDIT_DELAY.
+
+        Args:
+            user_id: ID пользователя
+            chat_id: ID чата
+            message_id: ID сообщения с клавиатурой
+        """
+        cancel_sports_edit(chat_id, message_id)
+        loop = asyncio.get_running_loop()
+
+        def start_edit():
+            pending_sports_edits.pop((chat_id, message_id), None)
+            # Запрос к Telegram блокирующий, выполняем его вне event loop
+            future = loop.run_in_executor(None, flush_sports_edit, user_id, chat_id, message_id)
+            future.add_done_callback(_log_sports_edit_error)
+
+        pending_sports_edits[(chat_id, message_id)] = loop.call_later(
+            _SPORTS_EDIT_DELAY, start_edit
         )
 
+    def cancel_sports_edit(chat_id: int, message_id: int):
+        """Отменить запланированное обновление сообщения."""
+        handle = pending_sports_edits.pop((chat_id, message_id), None)
+        if handle is not None:
+            handle.cancel()
+
+    def flush_sports_edit(user_id: int, chat_id: int, message_id: int):
+        """Показать в сообщении текущий выбор видов спорта."""
+        # Правка могла попасть в пул уже после «Готово»: профиль сохранён,
+        # и сообщение больше не меняем
+        if bot.get_state(user_id, chat_id) != RegistrationStates.waiting_sports.name:
+            return
+        # Только чтение: retrieve_data() записал бы копию данных обратно
+        # поверх переключений, сделанных за это время
+        data = get_state_data(bot, user_id, chat_id)
+        selected = list(data.get("sports", []))
+
+        status = f"\n\nВыбрано: {', '.join(selected) if selected else 'ничего'}"
+        try:
+            bot.edit_message_text(
+                f"Выберите виды спорта:{status}",
+                chat_id,
+                message_id,
+                reply_markup=sports_keyboard,
+            )
+        except ApiTelegramException as e:
+            # Выбор мог вернуться к уже показанному — Telegram отклоняет такую правку
+            logger.debug("Сообщение с видами спорта не обновлено: {}", e)
+
     @bot.callback_query_handler(
         state=RegistrationStates.waiting_sports,
-        func=lambda call: call.data.startswith("sport_") or call.data == "sports_done",
+        func=lambda call: call.data.startswith(_SPORT_PREFIX) or call.data == "sports_done",
     )
     @safe_cb
     def process_sport_selection(call):
         """Обработка выбора видов спорта."""
-        asyncio.run(_process_sport_selection_async(call))
+        run_async(_process_sport_selection_async(call))
 
     async def _process_sport_selection_async(call):
         """Async реализация process_sport_selection."""
         if call.data == "sports_done":
-            with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-                sports = data.get("sports", [])
-                if not sports:
-                    bot.answer_callback_query(call.id, "❌ Выберите хотя бы один вид спорта")
-                    return
-
-                api_user = await api_client.get_user_by_telegram_id(call.from_user.id)
-                if api_user:
-                    await api_client.update_user(
-                        api_user["id"],
-                        age=data.get("age"),
-                        gender=data.get("gender"),
-                        city=data.get("city"),
-                        sports=sports,
-                    )
-                else:
-                    await api_client.get_or_create_user(
-                        telegram_id=call.from_user.id,
-                        username=call.from_user.username,
-                        first_name=call.from_user.first_name or "Пользователь",
-                        age=data.get("age"),
-                        gender=data.get("gender"),
-                        city=data.get("city"),
-                        sports=sports,
-                    )
-
-                bot.delete_state(call.from_user.id, call.message.chat.id)
-                bot.answer_callback_query(call.id, "✅ Готово!")
-                updated_user = await api_client.get_user_by_telegram_id(call.from_user.id)
-                bot.send_message(
-                    call.message.chat.id,
-                    "🎉 Профиль создан!\n\nТеперь вы можете:\n• Создавать тренировки\n• Искать тренировки\n• Редактировать профиль",
-                    reply_markup=get_main_menu_keyboard(
-                        is_admin=bool(updated_user and updated_user.get("is_admin"))
-                    ),
+            data = await asyncio.to_thread(
+                get_state_data, bot, call.from_user.id, call.message.chat.id
+            )
+            sports = data.get("sports", [])
+            if not sports:
+                ack_callback(bot, call.id, "❌ Выберите хотя бы один вид спорта")
+                return
+
+            api_user = await api_client.get_user_by_telegram_id(call.from_user.id)
+            if api_user:
+                updated_user = await api_client.update_user(
+                    api_user["id"],
+                    age=data.get("age"),
+                    gender=data.get("gender"),
+                    city=data.get("city"),
+                    sports=sports,
                 )
-        else:
-            sport = call.data.replace("sport_", "")
-            with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-                if "sports" not in data:
-                    data["sports"] = []
-
-                if sport in data["sports"]:
-                    data["sports"].remove(sport)
-                    bot.answer_callback_query(call.id, f"❌ {sport}")
-                else:
-                    data["sports"].append(sport)
-                    bot.answer_callback_query(call.id, f"✅ {sport}")
-
-                selected = data["sports"]
-                status = f"\n\nВыбрано: {', '.join(selected) if selected else 'ничего'}"
-                bot.edit_message_text(
-                    f"Выберите виды спорта:{status}",
-                    call.message.chat.id,
-                    call.message.message_id,
-                    reply_markup=get_sports_keyboard(),
+            else:
+                updated_user = await api_client.get_or_create_user(
+                    telegram_id=call.from_user.id,
+                    username=call.from_user.username,
+                    first_name=call.from_user.first_name or "Пользователь",
+                    age=data.get("age"),
+                    gender=data.get("gender"),
+                    city=data.get("city"),
+                    sports=sports,
                 )
+
+            cancel_sports_edit(call.message.chat.id, call.message.message_id)
+            await abot.delete_state(call.from_user.id, call.message.chat.id)
+            ack_callback(bot, call.id, "✅ Готово!")
+            await abot.send_message(
+                call.message.chat.id,
+                "🎉 Профиль создан!\n\nТеперь вы можете:\n• Создавать тренировки\n• Искать тренировки\n• Редактировать профиль",
+                reply_markup=get_main_menu_keyboard(is_admin=updated_user["is_admin"]),
+            )
+        else:
+            sport = call.data[_SPORT_PREFIX_LEN:]
+            added, _ = await asyncio.to_thread(
+                toggle_state_item, bot, call.from_user.id, call.message.chat.id, "sports", sport
+            )
+            ack_callback(bot, call.id, f"✅ {sport}" if added else f"❌ {sport}")
+
+            schedule_sports_edit(call.from_user.id, call.message.chat.id, call.message.message_id)
@@ -2,13 +2,23 @@
 Обработчик неизвестных команд и сообщений.
 """
 
-import asyncio
-
 from api_client import api_client
 from common import get_main_menu_keyboard_for_user
 from loguru import logger
 from telebot import TeleBot
 from telebot.types import Message
+from utils import get_update_state, run_async
+
+_CANCELLED_TEXT = "❌ Процесс отменён.\nИспользуйте /start для возврата в главное меню."
+_NOTHING_TO_CANCEL_TEXT = "Нет активного процесса для отмены."
+_UNKNOWN_COMMAND_TEXT = (
+    "❓ Неизвестная команда.\n\n"
+    "Используйте /help для списка доступных команд или выберите действие из меню:"
+)
+_UNKNOWN_MESSAGE_TEXT = (
+    "❓ Не понимаю эту команду.\n\n"
+    "Используйте /help для списка доступных команд или выберите действие из меню:"
+)
 
 
 def register_unknown_handlers(bot: TeleBot):
@@ -23,29 +33,25 @@ def register_unknown_handlers(bot: TeleBot):
     def cmd_cancel(message: Message):
         """Отменить текущий процесс (регистрация, создание события)."""
         user = message.from_user
-        logger.info(f"👤 /cancel от @{user.username} (id={user.id})")
-        logger.debug(f"🔧 cmd_cancel вызван для @{user.username} (id={user.id})")
+        logger.info("👤 /cancel от @{} (id={})", user.username, user.id)
+        logger.debug("🔧 cmd_cancel вызван для @{} (id={})", user.username, user.id)
 
         # Проверяем, есть ли активное состояние
         current_state = bot.get_state(user.id, message.chat.id)
 
         if current_state:
             bot.delete_state(user.id, message.chat.id)
-            keyboard = asyncio.run(
-                get_main_menu_keyboard_for_user(api_client, message.from_user.id)
-            )
+            keyboard = run_async(get_main_menu_keyboard_for_user(api_client, message.from_user.id))
             bot.send_message(
                 message.chat.id,
-                "❌ Процесс отменён.\n" "Используйте /start для возврата в главное меню.",
+                _CANCELLED_TEXT,
                 reply_markup=keyboard,
             )
         else:
-            keyboard = asyncio.run(
-                get_main_menu_keyboard_for_user(api_client, message.from_user.id)
-            )
+            keyboard = run_async(get_main_menu_keyboard_for_user(api_client, message.from_user.id))
             bot.send_message(
                 message.chat.id,
-                "Нет активного процесса для отмены.",
+                _NOTHING_TO_CANCEL_TEXT,
                 reply_markup=keyboard,
             )
 
@@ -54,15 +60,16 @@ def register_unknown_handlers(bot: TeleBot):
         if message.content_type != "text":
             return False
 
-        current_state = bot.get_state(message.from_user.id, message.chat.id)
+        current_state = get_update_state(bot, message, message.from_user.id, message.chat.id)
         has_no_state = current_state is None
 
         # Логируем проверку для отладки
         logger.debug(
-            f"🔍 Проверка состояния для handle_unknown_message: "
-            f"user_id={message.from_user.id}, "
-            f"current_state={current_state}, "
-            f"has_no_state={has_no_state}"
+            "🔍 Проверка состояния для handle_unknown_message: "
+            "user_id={}, current_state={}, has_no_state={}",
+            message.from_user.id,
+            current_state,
+            has_no_state,
         )
 
         return has_no_state
@@ -79,39 +86,30 @@ def register_unknown_handlers(bot: TeleBot):
         """
         user = message.from_user
 
-        # Дополнительная проверка на случай, если состояние изменилось между проверкой в func и вызовом функции
-        current_state = bot.get_state(user.id, message.chat.id)
+        # Состояние уже прочитано в check_no_state для этого же обновления
+        current_state = get_update_state(bot, message, user.id, message.chat.id)
         if current_state:
             logger.warning(
-                f"⚠️ handle_unknown_message вызван для сообщения со стейтом! "
-                f"@{user.username} (id={user.id}): text='{message.text}', state={current_state}"
+                "⚠️ handle_unknown_message вызван для сообщения со стейтом! "
+                "@{} (id={}): text='{}', state={}",
+                user.username,
+                user.id,
+                message.text,
+                current_state,
             )
             return  # Пропускаем, пусть обрабатывают стейт-обработчики
 
         logger.info(
-            f"⚠️ handle_unknown_message вызван для @{user.username} (id={user.id}): "
-            f"text='{message.text}', state={current_state}"
+            "⚠️ handle_unknown_message вызван для @{} (id={}): text='{}', state={}",
+            user.username,
+            user.id,
+            message.text,
+            current_state,
         )
-        logger.debug(f"Неизвестное сообщение от @{user.username}: {message.text}")
+        logger.debug("Неизвестное сообщение от @{}: {}", user.username, message.text)
 
         # Проверяем, не является ли это командой
-        if message.text and message.text.startswith("/"):
-            keyboard = asyncio.run(
-                get_main_menu_keyboard_for_user(api_client, message.from_user.id)
-            )
-            bot.send_message(
-                message.chat.id,
-                "❓ Неизвестная команда.\n\n"
-                "Используйте /help для списка доступных команд или выберите действие из меню:",
-                reply_markup=keyboard,
-            )
-        else:
-            keyboard = asyncio.run(
-                get_main_menu_keyboard_for_user(api_client, message.from_user.id)
-            )
-            bot.send_message(
-                message.chat.id,
-                "❓ Не понимаю эту команду.\n\n"
-                "Используйте /help для списка доступных команд или выберите действие из меню:",
-                reply_markup=keyboard,
-            )
+        text = message.text
+        reply = _UNKNOWN_COMMAND_TEXT if text and text[0] == "/" else _UNKNOWN_MESSAGE_TEXT
+        keyboard = run_async(get_main_menu_keyboard_for_user(api_client, message.from_user.id))
+        bot.send_message(message.chat.id, reply, reply_markup=keyboard)
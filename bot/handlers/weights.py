@@ -4,14 +4,31 @@
 
 import asyncio
 from datetime import date, datetime
+from functools import lru_cache
 
 from api_client import api_client
+from cache import TTLCache
 from common import get_main_menu_keyboard_for_user, get_user_or_error
+from keyboards import FrozenMarkup
 from loguru import logger
 from states import WeightStates
 from telebot import TeleBot
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from utils import safe_callback, safe_handler
+from utils import (
+    AsyncBot,
+    ack_callback,
+    callback_router,
+    get_state_data,
+    safe_callback,
+    safe_handler,
+    set_state_with_data,
+    state_router,
+    text_router,
+)
+
+_WEIGHTS_MENU_TEXT = "⚖️ <b>Мои рабочие веса</b>\nВыберите действие:"
+# Упражнения пользователя по его ID: меню «Добавить» и «Прогресс» открываются подряд
+_exercises_cache = TTLCache(maxsize=10_000, ttl=60)
 
 
 def register_weights_handlers(bot: TeleBot):
@@ -23,28 +40,37 @@ def register_weights_handlers(bot: TeleBot):
     """
     safe = safe_handler(bot)
     safe_cb = safe_callback(bot)
+    # Вызовы Telegram из async-обработчиков не блокируют event loop
+    abot = AsyncBot(bot)
+
+    # Меню весов и выбор даты не меняются, поэтому собираются один раз
+    weights_menu_markup = InlineKeyboardMarkup(row_width=2)
+    weights_menu_markup.add(
+        InlineKeyboardButton("➕ Добавить вес", callback_data="weights_add"),
+        InlineKeyboardButton("📈 Прогресс", callback_data="weights_progress"),
+    )
+    weights_menu_markup.add(InlineKeyboardButton("⬅️ Назад", callback_data="weights_back_main"))
+    weights_menu_keyboard = FrozenMarkup(weights_menu_markup)
 
-    def get_weights_menu_keyboard() -> InlineKeyboardMarkup:
-        """Клавиатура меню весов."""
-        keyboard = InlineKeyboardMarkup(row_width=2)
-        keyboard.add(
-            InlineKeyboardButton("➕ Добавить вес", callback_data="weights_add"),
-            InlineKeyboardButton("📈 Прогресс", callback_data="weights_progress"),
-        )
-        keyboard.add(InlineKeyboardButton("⬅️ Назад", callback_data="weights_back_main"))
-        return keyboard
+    date_markup = InlineKeyboardMarkup()
+    date_markup.add(InlineKeyboardButton("📅 Сегодня", callback_data="weight_date_today"))
+    date_keyboard = FrozenMarkup(date_markup)
 
+    @lru_cache(maxsize=2048)
     def get_exercises_keyboard(
-        exercises: list[str],
+        exercises: tuple[str, ...],
         prefix: str,
         include_new: bool = False,
         include_back: bool = True,
-    ) -> InlineKeyboardMarkup:
+    ) -> FrozenMarkup:
         """
         Построить клавиатуру упражнений.
 
+        Списки упражнений меняются редко, поэтому готовые клавиатуры
+        кешируются вместе с JSON.
+
         Args:
-            exercises: Список упражнений
+            exercises: Упражнения (кортеж, чтобы служить ключом кеша)
             prefix: Префикс callback_data для индексов
             include_new: Добавить кнопку ручного ввода
             include_back: Добавить кнопку Назад
@@ -56,7 +82,20 @@ def register_weights_handlers(bot: TeleBot):
             keyboard.add(InlineKeyboardButton("✍️ Ввести новое", callback_data="weight_ex_new"))
         if include_back:
             keyboard.add(InlineKeyboardButton("⬅️ Назад", callback_data="weights_menu"))
-        return keyboard
+        return FrozenMarkup(keyboard)
+
+    async def get_exercises(user_id: int) -> list[str]:
+        """
+        Получить упражнения пользователя, по возможности из кеша.
+
+        Args:
+            user_id: ID пользователя в API
+        """
+        exercises = _exercises_cache.get(user_id)
+        if exercises is None:
+            exercises = await api_client.get_weight_exercises(user_id)
+            _exercises_cache.set(user_id, exercises)
+        return exercises
 
     def format_weight_value(value: float) -> str:
         """
@@ -75,41 +114,38 @@ def register_weights_handlers(bot: TeleBot):
         Args:
             value: Дата в ISO формате
         """
+        # API отдаёт даты как YYYY-MM-DD: достаточно переставить части строки
+        if len(value) >= 10 and value[4] == value[7] == "-" and value[10:11] in ("", "T", " "):
+            return f"{value[8:10]}.{value[5:7]}.{value[:4]}"
         try:
             return datetime.fromisoformat(value).strftime("%d.%m.%Y")
         except ValueError:
             return value
 
-    def get_date_keyboard() -> InlineKeyboardMarkup:
-        """Клавиатура выбора даты."""
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("📅 Сегодня", callback_data="weight_date_today"))
-        return keyboard
-
-    @bot.message_handler(func=lambda m: m.text == "⚖️ Мои рабочие веса")
+    @text_router.route("⚖️ Мои рабочие веса")
     @safe
     def weights_menu(message: Message):
         """Показать меню весов."""
         bot.send_message(
             message.chat.id,
-            "⚖️ <b>Мои рабочие веса</b>\nВыберите действие:",
-            reply_markup=get_weights_menu_keyboard(),
+            _WEIGHTS_MENU_TEXT,
+            reply_markup=weights_menu_keyboard,
         )
 
-    @bot.callback_query_handler(func=lambda call: call.data == "weights_back_main")
+    @callback_router.route("weights_back_main")
     @safe_cb
-    def weights_back_main(call):
+    async def weights_back_main(call):
         """Вернуться в главное меню."""
-        bot.delete_state(call.from_user.id, call.message.chat.id)
-        bot.answer_callback_query(call.id, "✅")
-        keyboard = asyncio.run(get_main_menu_keyboard_for_user(api_client, call.from_user.id))
-        bot.send_message(
+        await abot.delete_state(call.from_user.id, call.message.chat.id)
+        await abot.answer_callback_query(call.id, "✅")
+        keyboard = await get_main_menu_keyboard_for_user(api_client, call.from_user.id)
+        await abot.send_message(
             call.message.chat.id,
             "Выберите действие:",
             reply_markup=keyboard,
         )
 
-    @bot.callback_query_handler(func=lambda call: call.data == "weights_menu")
+    @callback_router.route("weights_menu")
     @safe_cb
     def weights_menu_callback(call):
         """Показать меню весов из callback."""
@@ -117,21 +153,19 @@ def register_weights_handlers(bot: TeleBot):
         bot.answer_callback_query(call.id, "✅")
         bot.send_message(
             call.message.chat.id,
-            "⚖️ <b>Мои рабочие веса</b>\nВыберите действие:",
-            reply_markup=get_weights_menu_keyboard(),
+            _WEIGHTS_MENU_TEXT,
+            reply_markup=weights_menu_keyboard,
         )
 
-    @bot.callback_query_handler(func=lambda call: call.data == "weights_add")
+    @callback_router.route("weights_add")
     @safe_cb
-    def start_add_weight(call):
+    async def start_add_weight(call):
         """Начать добавление веса."""
-        asyncio.run(_start_add_weight_async(call))
-
-    async def _start_add_weight_async(call):
-        """Async реализация start_add_weight."""
         logger.info(
-            f"⚖️ Добавление рабочего веса от @{call.from_user.username or call.from_user.id}"
+            "⚖️ Добавление рабочего веса от @{}", call.from_user.username or call.from_user.id
         )
+        # Убираем «часики» на кнопке, не дожидаясь ответов API
+        ack_callback(bot, call.id, "✅")
         user = await get_user_or_error(
             api_client,
             bot,
@@ -141,33 +175,31 @@ def register_weights_handlers(bot: TeleBot):
         if not user:
             return
 
-        exercises = await api_client.get_weight_exercises(user["id"])
-
-        bot.answer_callback_query(call.id, "✅")
-        if exercises:
-            bot.set_state(
-                call.from_user.id, WeightStates.waiting_exercise_choice, call.message.chat.id
-            )
-        else:
-            bot.set_state(
-                call.from_user.id, WeightStates.waiting_exercise_input, call.message.chat.id
-            )
+        exercises = await get_exercises(user["id"])
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            data["user_id"] = user["id"]
-            data["exercises"] = exercises
-        logger.debug(
-            f"weights_add: user_id={user['id']} exercises={len(exercises)}",
+        await asyncio.to_thread(
+            set_state_with_data,
+            bot,
+            call.from_user.id,
+            call.message.chat.id,
+            WeightStates.waiting_exercise_choice
+            if exercises
+            else WeightStates.waiting_exercise_input,
+            user_id=user["id"],
+            exercises=exercises,
         )
+        logger.debug("weights_add: user_id={} exercises={}", user["id"], len(exercises))
 
         if exercises:
-            bot.send_message(
+            await abot.send_message(
                 call.message.chat.id,
                 "Выберите упражнение или введите новое:",
-                reply_markup=get_exercises_keyboard(exercises, "weight_ex_idx_", include_new=True),
+                reply_markup=get_exercises_keyboard(
+                    tuple(exercises), "weight_ex_idx_", include_new=True
+                ),
             )
         else:
-            bot.send_message(call.message.chat.id, "Введите название упражнения:")
+            await abot.send_message(call.message.chat.id, "Введите название упражнения:")
 
     @bot.callback_query_handler(
         state=WeightStates.waiting_exercise_choice,
@@ -191,41 +223,49 @@ def register_weights_handlers(bot: TeleBot):
             bot.answer_callback_query(call.id, "❌ Ошибка выбора")
             return
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            exercises = data.get("exercises", [])
-            if idx < 0 or idx >= len(exercises):
-                bot.answer_callback_query(call.id, "❌ Упражнение не найдено")
-                return
-            data["exercise"] = exercises[idx]
-        logger.debug(f"weights_add: выбранное упражнение={exercises[idx]}")
+        data = get_state_data(bot, call.from_user.id, call.message.chat.id)
+        exercises = data.get("exercises", [])
+        if idx < 0 or idx >= len(exercises):
+            bot.answer_callback_query(call.id, "❌ Упражнение не найдено")
+            return
+        logger.debug("weights_add: выбранное упражнение={}", exercises[idx])
 
         bot.answer_callback_query(call.id, "✅")
-        bot.set_state(call.from_user.id, WeightStates.waiting_date, call.message.chat.id)
+        set_state_with_data(
+            bot,
+            call.from_user.id,
+            call.message.chat.id,
+            WeightStates.waiting_date,
+            exercise=exercises[idx],
+        )
         bot.send_message(
             call.message.chat.id,
             "Введите дату замера (ДД.ММ.ГГГГ):",
-            reply_markup=get_date_keyboard(),
+            reply_markup=date_keyboard,
         )
 
-    @bot.message_handler(state=WeightStates.waiting_exercise_input, content_types=["text"])
+    @state_router.route(WeightStates.waiting_exercise_input)
     @safe
     def process_exercise_input(message: Message):
         """Обработка ручного ввода упражнения."""
-        if message.text and message.text.startswith("/"):
-            return
         if not message.text or len(message.text.strip()) < 2:
             bot.send_message(message.chat.id, "❌ Введите корректное название упражнения")
             return
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data["exercise"] = message.text.strip()
-        logger.debug(f"weights_add: введённое упражнение={message.text.strip()}")
+        exercise = message.text.strip()
+        logger.debug("weights_add: введённое упражнение={}", exercise)
 
-        bot.set_state(message.from_user.id, WeightStates.waiting_date, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            WeightStates.waiting_date,
+            exercise=exercise,
+        )
         bot.send_message(
             message.chat.id,
             "Введите дату замера (ДД.ММ.ГГГГ):",
-            reply_markup=get_date_keyboard(),
+            reply_markup=date_keyboard,
         )
 
     @bot.callback_query_handler(
@@ -236,20 +276,22 @@ def register_weights_handlers(bot: TeleBot):
     def process_weight_date_today(call):
         """Выбор текущей даты замера."""
         today_value = date.today().isoformat()
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            data["date"] = today_value
-        logger.debug(f"weights_add: дата={today_value}")
+        logger.debug("weights_add: дата={}", today_value)
 
         bot.answer_callback_query(call.id, "✅")
-        bot.set_state(call.from_user.id, WeightStates.waiting_weight, call.message.chat.id)
+        set_state_with_data(
+            bot,
+            call.from_user.id,
+            call.message.chat.id,
+            WeightStates.waiting_weight,
+            date=today_value,
+        )
         bot.send_message(call.message.chat.id, "Введите вес (например, 45.5):")
 
-    @bot.message_handler(state=WeightStates.waiting_date, content_types=["text"])
+    @state_router.route(WeightStates.waiting_date)
     @safe
     def process_weight_date(message: Message):
         """Обработка даты замера."""
-        if message.text and message.text.startswith("/"):
-            return
         if not message.text:
             bot.send_message(message.chat.id, "❌ Укажите дату в формате ДД.ММ.ГГГГ")
             return
@@ -263,41 +305,50 @@ def register_weights_handlers(bot: TeleBot):
             bot.send_message(message.chat.id, "❌ Неверный формат даты. Используйте ДД.ММ.ГГГГ")
             return
 
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            data["date"] = date_obj.isoformat()
-        logger.debug(f"weights_add: дата={data['date']}")
+        date_value = date_obj.isoformat()
+        logger.debug("weights_add: дата={}", date_value)
 
-        bot.set_state(message.from_user.id, WeightStates.waiting_weight, message.chat.id)
+        set_state_with_data(
+            bot,
+            message.from_user.id,
+            message.chat.id,
+            WeightStates.waiting_weight,
+            date=date_value,
+        )
         bot.send_message(message.chat.id, "Введите вес (например, 45.5):")
 
-    @bot.message_handler(state=WeightStates.waiting_weight, content_types=["text"])
+    @state_router.route(WeightStates.waiting_weight)
     @safe
-    def process_weight_value(message: Message):
+    async def process_weight_value(message: Message):
         """Обработка веса и сохранение записи."""
-        if message.text and message.text.startswith("/"):
-            return
+        text = message.text
         try:
-            weight_value = float(message.text.replace(",", "."))
+            text = text.strip()
+            if "," in text:
+                text = text.replace(",", ".")
+            weight_value = float(text)
             if weight_value <= 0:
                 raise ValueError
         except (ValueError, AttributeError):
-            bot.send_message(message.chat.id, "❌ Введите корректный вес (например, 45.5)")
+            await abot.send_message(message.chat.id, "❌ Введите корректный вес (например, 45.5)")
             return
 
-        asyncio.run(_save_weight_async(message, weight_value))
-
-    async def _save_weight_async(message: Message, weight_value: float):
-        """Async сохранение записи веса."""
-        with bot.retrieve_data(message.from_user.id, message.chat.id) as data:
-            user_id = data.get("user_id")
-            exercise = data.get("exercise")
-            date_value = data.get("date")
+        data = await asyncio.to_thread(get_state_data, bot, message.from_user.id, message.chat.id)
+        user_id = data.get("user_id")
+        exercise = data.get("exercise")
+        date_value = data.get("date")
 
         logger.debug(
-            f"weights_add: сохранение user_id={user_id} exercise={exercise} date={date_value} weight={weight_value}",
+            "weights_add: сохранение user_id={} exercise={} date={} weight={}",
+            user_id,
+            exercise,
+            date_value,
+            weight_value,
         )
         if not user_id or not exercise or not date_value:
-            bot.send_message(message.chat.id, "❌ Не удалось сохранить запись. Попробуйте ещё раз.")
+            await abot.send_message(
+                message.chat.id, "❌ Не удалось сохранить запись. Попробуйте ещё раз."
+            )
             return
 
         await api_client.create_weight(
@@ -306,24 +357,24 @@ def register_weights_handlers(bot: TeleBot):
             date=date_value,
             weight=weight_value,
         )
+        # Новое упражнение должно сразу появиться в списке
+        _exercises_cache.pop(user_id)
 
-        bot.delete_state(message.from_user.id, message.chat.id)
+        await abot.delete_state(message.from_user.id, message.chat.id)
         keyboard = await get_main_menu_keyboard_for_user(api_client, message.from_user.id)
-        bot.send_message(
+        await abot.send_message(
             message.chat.id,
             f"✅ Запись добавлена: {exercise} — {format_weight_value(weight_value)} кг",
             reply_markup=keyboard,
         )
 
-    @bot.callback_query_handler(func=lambda call: call.data == "weights_progress")
+    @callback_router.route("weights_progress")
     @safe_cb
-    def start_progress(call):
+    async def start_progress(call):
         """Начать просмотр прогресса."""
-        asyncio.run(_start_progress_async(call))
-
-    async def _start_progress_async(call):
-        """Async реализация start_progress."""
-        logger.info(f"📈 Прогресс весов от @{call.from_user.username or call.from_user.id}")
+        logger.info("📈 Прогресс весов от @{}", call.from_user.username or call.from_user.id)
+        # Результат ещё неизвестен: просто убираем «часики», ответ придёт сообщением
+        ack_callback(bot, call.id)
         user = await get_user_or_error(
             api_client,
             bot,
@@ -333,28 +384,30 @@ def register_weights_handlers(bot: TeleBot):
         if not user:
             return
 
-        exercises = await api_client.get_weight_exercises(user["id"])
+        exercises = await get_exercises(user["id"])
         if not exercises:
-            bot.answer_callback_query(call.id, "ℹ️")
-            bot.send_message(
+            await abot.send_message(
                 call.message.chat.id,
                 "У вас пока нет упражнений. Добавьте первую запись веса.",
-                reply_markup=get_weights_menu_keyboard(),
+                reply_markup=weights_menu_keyboard,
             )
             return
 
-        bot.answer_callback_query(call.id, "✅")
-        bot.set_state(
-            call.from_user.id, WeightStates.waiting_progress_exercise, call.message.chat.id
+        await asyncio.to_thread(
+            set_state_with_data,
+            bot,
+            call.from_user.id,
+            call.message.chat.id,
+            WeightStates.waiting_progress_exercise,
+            user_id=user["id"],
+            exercises=exercises,
         )
-
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            data["user_id"] = user["id"]
-            data["exercises"] = exercises
-        bot.send_message(
+        await abot.send_message(
             call.message.chat.id,
             "Выберите упражнение для просмотра прогресса:",
-            reply_markup=get_exercises_keyboard(exercises, "weight_prog_idx_", include_back=True),
+            reply_markup=get_exercises_keyboard(
+                tuple(exercises), "weight_prog_idx_", include_back=True
+            ),
         )
 
     @bot.callback_query_handler(
@@ -362,32 +415,28 @@ def register_weights_handlers(bot: TeleBot):
         func=lambda call: call.data.startswith("weight_prog_idx_"),
     )
     @safe_cb
-    def process_progress_exercise(call):
+    async def process_progress_exercise(call):
         """Обработка выбора упражнения для прогресса."""
-        asyncio.run(_process_progress_exercise_async(call))
-
-    async def _process_progress_exercise_async(call):
-        """Async реализация process_progress_exercise."""
         idx_str = call.data.replace("weight_prog_idx_", "")
         try:
             idx = int(idx_str)
         except ValueError:
-            bot.answer_callback_query(call.id, "❌ Ошибка выбора")
+            await abot.answer_callback_query(call.id, "❌ Ошибка выбора")
             return
 
-        with bot.retrieve_data(call.from_user.id, call.message.chat.id) as data:
-            user_id = data.get("user_id")
-            exercises = data.get("exercises", [])
+        data = await asyncio.to_thread(get_state_data, bot, call.from_user.id, call.message.chat.id)
+        user_id = data.get("user_id")
+        exercises = data.get("exercises", [])
 
         if not user_id or idx < 0 or idx >= len(exercises):
-            bot.answer_callback_query(call.id, "❌ Упражнение не найдено")
+            await abot.answer_callback_query(call.id, "❌ Упражнение не найдено")
             return
 
         exercise = exercises[idx]
+        ack_callback(bot, call.id)
         items = await api_client.get_weight_progress(user_id, exercise, limit=5)
         if not items:
-            bot.answer_callback_query(call.id, "ℹ️")
-            bot.send_message(call.message.chat.id, "Нет данных по этому упражнению.")
+            await abot.send_message(call.message.chat.id, "Нет данных по этому упражнению.")
             return
 
         ordered = list(reversed(items))
@@ -401,16 +450,18 @@ def register_weights_handlers(bot: TeleBot):
         else:
             delta_text = "— без изменений"
 
-        text = f"📈 <b>{exercise}</b>\n"
-        for item in ordered:
-            text += f"• {format_date(item['date'])}: {format_weight_value(item['weight'])} кг\n"
+        parts = [f"📈 <b>{exercise}</b>\n"]
+        parts.extend(
+            f"• {format_date(item['date'])}: {format_weight_value(item['weight'])} кг\n"
+            for item in ordered
+        )
         if len(ordered) > 1:
-            text += f"\nΔ {delta_text}"
+            parts.append(f"\nΔ {delta_text}")
+        text = "".join(parts)
 
-        bot.answer_callback_query(call.id, "✅")
-        bot.delete_state(call.from_user.id, call.message.chat.id)
-        bot.send_message(
+        await abot.delete_state(call.from_user.id, call.message.chat.id)
+        await abot.send_message(
             call.message.chat.id,
             text,
-            reply_markup=get_weights_menu_keyboard(),
+            reply_markup=weights_menu_keyboard,
         )
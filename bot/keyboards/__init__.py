@@ -1,4 +1,5 @@
 from keyboards.admin_menu import get_admin_menu_keyboard
+from keyboards.frozen import FrozenMarkup
 from keyboards.main_menu import get_main_menu_keyboard
 
-__all__ = ["get_main_menu_keyboard", "get_admin_menu_keyboard"]
+__all__ = ["get_main_menu_keyboard", "get_admin_menu_keyboard", "FrozenMarkup"]
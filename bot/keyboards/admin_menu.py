@@ -2,18 +2,23 @@
 Клавиатуры для администрирования.
 """
 
+from functools import lru_cache
+
 from telebot.types import KeyboardButton, ReplyKeyboardMarkup
 
+from keyboards.frozen import FrozenMarkup
+
 
-def get_admin_menu_keyboard() -> ReplyKeyboardMarkup:
+@lru_cache(maxsize=1)
+def get_admin_menu_keyboard() -> FrozenMarkup:
     """
     Получить клавиатуру админ-меню.
 
     Returns:
-        ReplyKeyboardMarkup с кнопками админ-меню
+        Клавиатура с кнопками админ-меню, сериализованная один раз
     """
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     keyboard.add(KeyboardButton("📣 Рассылка всем"))
     keyboard.add(KeyboardButton("✉️ Личное сообщение"))
     keyboard.add(KeyboardButton("⬅️ Назад"))
-    return keyboard
+    return FrozenMarkup(keyboard)
@@ -0,0 +1,33 @@
+"""
+Клавиатуры, сериализуемые в JSON один раз.
+"""
+
+from telebot.types import InlineKeyboardMarkup, JsonSerializable, ReplyKeyboardMarkup
+
+
+class FrozenMarkup(JsonSerializable):
+    """
+    Неизменяемая клавиатура с заранее подготовленным JSON.
+
+    telebot вызывает to_json() у reply_markup при каждой отправке,
+    обходя все кнопки. Для клавиатур, которые не меняются, JSON
+    строится один раз при создании.
+    """
+
+    __slots__ = ("_json",)
+
+    def __init__(self, markup: InlineKeyboardMarkup | ReplyKeyboardMarkup):
+        """
+        Args:
+            markup: Исходная клавиатура
+        """
+        self._json = markup.to_json()
+
+    def to_json(self) -> str:
+        """
+        Получить JSON клавиатуры.
+
+        Returns:
+            Сериализованная клавиатура
+        """
+        return self._json
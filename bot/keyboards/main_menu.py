@@ -2,15 +2,27 @@
 Клавиатуры для главного меню бота.
 """
 
+from functools import lru_cache
+
 from telebot.types import KeyboardButton, ReplyKeyboardMarkup
 
+from keyboards.frozen import FrozenMarkup
+
 
-def get_main_menu_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
+@lru_cache(maxsize=2)
+def get_main_menu_keyboard(is_admin: bool = False) -> FrozenMarkup:
     """
     Получить клавиатуру главного меню.
 
+    Вариантов всего два (обычный пользователь и администратор), поэтому
+    клавиатуры кэшируются уже сериализованными в JSON и не пересобираются
+    на каждое сообщение.
+
+    Args:
+        is_admin: Добавить кнопку администрирования
+
     Returns:
-        ReplyKeyboardMarkup с кнопками меню
+        Клавиатура с кнопками меню
     """
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     keyboard.add(
@@ -27,4 +39,4 @@ def get_main_menu_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
     )
     if is_admin:
         keyboard.add(KeyboardButton("Администрирование"))
-    return keyboard
+    return FrozenMarkup(keyboard)
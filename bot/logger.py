@@ -20,6 +20,8 @@ def setup_logger():
         format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
         level=log_level,
         colorize=True,
+        # Запись идёт в фоновом потоке, обработчики не ждут вывода
+        enqueue=True,
     )
 
     # Файловый лог для продакшена
@@ -30,9 +32,10 @@ def setup_logger():
             retention="7 days",
             level="INFO",
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}",
+            enqueue=True,
+            # Без расширенных трейсбеков со значениями переменных
+            backtrace=False,
+            diagnose=False,
         )
 
     return logger
-
-
-setup_logger()
@@ -5,41 +5,64 @@
 import asyncio
 
 import httpx
+from api_client import api_client
 from config import settings
 from handlers import register_all_handlers
+from logger import setup_logger
 from loguru import logger
 from middleware import log_message_middleware
-from telebot.custom_filters import StateFilter
+from utils import CachedStateFilter, get_event_loop, run_async
 
 from bot import bot
 
+# Путь, на который Telegram отправляет обновления
+WEBHOOK_PATH = "telegram/webhook/"
+
 
 async def check_api_connection() -> bool:
-    """Проверка подключения к Backend API при старте."""
+    """Проверка подключения к Backend API при старте (только логирует результат)."""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{settings.api_base_url.replace('/api/v1', '')}/health")
-            if response.status_code == 200:
-                logger.info(f"✅ Backend API доступен: {settings.api_base_url}")
-                return True
-            logger.warning(f"⚠️ Backend API вернул статус {response.status_code}")
-            return False
-    except Exception as e:
-        logger.error(f"❌ Backend API недоступен ({settings.api_base_url}): {e}")
+        status_code = await api_client.check_health()
+        if status_code == 200:
+            logger.info("✅ Backend API доступен: {}", settings.api_base_url)
+            return True
+        logger.warning("⚠️ Backend API вернул статус {}", status_code)
+        return False
+    except httpx.HTTPError as e:
+        logger.error("❌ Backend API недоступен ({}): {}", settings.api_base_url, e)
         return False
 
 
+def run_webhook():
+    """
+    Получать обновления через webhook вместо long polling.
+
+    Telegram получает ответ 200 сразу: обработчики выполняются в пуле
+    потоков бота, а не в запросе webhook.
+    """
+    webhook_url = f"{settings.webhook_url.rstrip('/')}/{WEBHOOK_PATH}"
+    logger.info("🌐 Webhook: {}", webhook_url)
+    bot.run_webhooks(
+        listen=settings.webhook_listen,
+        port=settings.webhook_port,
+        url_path=WEBHOOK_PATH,
+        webhook_url=webhook_url,
+        secret_token=settings.webhook_secret or None,
+    )
+
+
 def main():
     """Запуск бота."""
+    setup_logger()
     logger.info("🤖 Запуск бота...")
-    logger.info(f"📡 API: {settings.api_base_url}")
+    logger.info("📡 API: {}", settings.api_base_url)
 
-    # Проверяем подключение к API
-    if not asyncio.run(check_api_connection()):
-        logger.warning("⚠️ Продолжаем запуск без проверки API")
+    # Проверяем подключение к API в фоне: результат только логируется,
+    # поэтому запуск бота не ждёт ответа или таймаута
+    asyncio.run_coroutine_threadsafe(check_api_connection(), get_event_loop())
 
     # Регистрируем фильтры, middleware и обработчики
-    bot.add_custom_filter(StateFilter(bot))
+    bot.add_custom_filter(CachedStateFilter(bot))
     log_message_middleware(bot)
     register_all_handlers(bot)
 
@@ -47,10 +70,17 @@ def main():
     logger.info("🚀 Бот запущен!")
 
     try:
-        bot.infinity_polling(timeout=60, long_polling_timeout=60)
+        if settings.webhook_url:
+            run_webhook()
+        else:
+            # getUpdates не работает, пока у бота установлен webhook
+            bot.remove_webhook()
+            bot.infinity_polling(timeout=60, long_polling_timeout=60)
     except Exception as e:
-        logger.error(f"❌ Критическая ошибка: {e}")
+        logger.error("❌ Критическая ошибка: {}", e)
         raise
+    finally:
+        run_async(api_client.close())
 
 
 if __name__ == "__main__":
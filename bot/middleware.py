@@ -22,11 +22,16 @@ def log_message_middleware(bot: TeleBot) -> None:
         if not user:
             return
 
+        # Обычный текст не логируется: выходим до форматирования имени
+        content_type = message.content_type
+        if content_type == "text" and not message.text.startswith("/"):
+            return
+
         username = f"@{user.username}" if user.username else f"id{user.id}"
 
+        # Логируем медиа; для них .text не читаем
+        if content_type != "text":
+            logger.info("📎 {} от {}", content_type, username)
         # Логируем команды
-        if message.text and message.text.startswith("/"):
-            logger.info(f"📨 {message.text} от {username}")
-        # Логируем медиа
-        elif message.content_type != "text":
-            logger.info(f"📎 {message.content_type} от {username}")
+        else:
+            logger.info("📨 {} от {}", message.text, username)
@@ -0,0 +1,142 @@
+"""
+Ограничение частоты исходящих сообщений под лимиты Telegram.
+"""
+
+import asyncio
+import threading
+import time
+
+# Лимиты Telegram: около 30 сообщений в секунду на бота
+# и около одного сообщения в секунду в один чат (короткие всплески допустимы)
+GLOBAL_RATE = 30.0
+CHAT_RATE = 1.0
+CHAT_BURST = 20
+# Дольше этого времени после ответа 429 запрос не повторяется, а завершается ошибкой
+MAX_RETRY_AFTER = 5
+# При таком числе чатов из памяти удаляются корзины простаивающих чатов
+_MAX_CHAT_BUCKETS = 10_000
+
+
+class TokenBucket:
+    """Корзина токенов: rate токенов в секунду, не больше capacity."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        """
+        Args:
+            rate: Скорость пополнения, токенов в секунду
+            capacity: Размер корзины
+            now: Текущее время (time.monotonic)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """
+        Забрать токен, при необходимости в долг.
+
+        Args:
+            now: Текущее время (time.monotonic)
+
+        Returns:
+            Сколько секунд нужно подождать до использования токена
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def is_full(self, now: float) -> bool:
+        """Корзина полностью пополнилась — чат давно ничего не получал."""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class SendRateLimiter:
+    """
+    Потокобезопасный ограничитель: общий лимит бота и отдельный лимит на чат.
+
+    Запросы сверх лимита не отбрасываются, а ждут своей очереди,
+    поэтому Telegram не отвечает 429 и не приходится повторять запросы.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        chat_rate: float = CHAT_RATE,
+        chat_burst: int = CHAT_BURST,
+    ):
+        """
+        Args:
+            global_rate: Сообщений в секунду на бота
+            chat_rate: Сообщений в секунду в один чат
+            chat_burst: Сообщений подряд в один чат без ожидания
+        """
+        now = time.monotonic()
+        self._global = TokenBucket(global_rate, global_rate, now)
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._chats: dict[int | str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, chat_id: int | str):
+        """
+        Дождаться возможности отправить сообщение в чат.
+
+        Ожидание блокирует поток, поэтому из event loop вызывать нельзя:
+        async-обработчики отправляют сообщения через AsyncBot.
+
+        Args:
+            chat_id: ID чата
+
+        Raises:
+            RuntimeError: Вызов из потока с работающим event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "send_limiter.wait() заблокировал бы event loop, используйте AsyncBot"
+            )
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                if len(self._chats) >= _MAX_CHAT_BUCKETS:
+                    self._drop_idle(now)
+                bucket = self._chats[chat_id] = TokenBucket(self._chat_rate, self._chat_burst, now)
+            delay = max(self._global.reserve(now), bucket.reserve(now))
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, chat_id: int | str, seconds: float):
+        """
+        Не отправлять сообщения в чат указанное время (ответ 429 от Telegram).
+
+        Args:
+            chat_id: ID чата
+            seconds: Значение retry_after из ответа Telegram
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                bucket = self._chats[chat_id] = TokenBucket(self._chat_rate, self._chat_burst, now)
+            # Первый токен освободится ровно через seconds
+            bucket.tokens = 1 - seconds * bucket.rate
+            bucket.updated = now
+
+    def _drop_idle(self, now: float):
+        """Удалить корзины чатов, которые уже полностью пополнились."""
+        self._chats = {
+            chat_id: bucket for chat_id, bucket in self._chats.items() if not bucket.is_full(now)
+        }
+
+
+# Общий ограничитель для всех исходящих сообщений бота
+send_limiter = SendRateLimiter()
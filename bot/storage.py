@@ -0,0 +1,174 @@
+"""
+Хранилища FSM состояний бота.
+"""
+
+import json
+import threading
+from typing import Any
+
+from telebot.states import State
+from telebot.storage import StateMemoryStorage, StateRedisStorage
+
+
+class MemoryStateStorage(StateMemoryStorage):
+    """Хранилище состояний в памяти с совмещённой записью данных и состояния."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def set_data_and_state(
+        self,
+        chat_id: int,
+        user_id: int,
+        state: State | str,
+        data: dict[str, Any],
+        bot_id: int | None = None,
+    ) -> bool:
+        """
+        Обновить данные и установить состояние одной операцией.
+
+        Заменяет пару retrieve_data() + set_state(), которая обращается
+        к хранилищу дважды.
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+            state: Новое состояние
+            data: Поля для добавления в данные состояния
+            bot_id: ID бота
+
+        Returns:
+            True при успехе
+        """
+        if isinstance(state, State):
+            state = state.name
+
+        key = self._get_key(chat_id, user_id, self.prefix, self.separator, bot_id=bot_id)
+        with self._lock:
+            record = self.data.setdefault(key, {"state": state, "data": {}})
+            record["state"] = state
+            record["data"].update(data)
+        return True
+
+    def toggle_data_item(
+        self,
+        chat_id: int,
+        user_id: int,
+        field: str,
+        value: Any,
+        bot_id: int | None = None,
+    ) -> tuple[bool, list[Any]]:
+        """
+        Добавить значение в список данных состояния или убрать его оттуда.
+
+        Изменяет список на месте, без копирования всех данных,
+        как это делает retrieve_data().
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+            field: Поле со списком
+            value: Значение
+            bot_id: ID бота
+
+        Returns:
+            (True, если значение добавлено; список после изменения)
+        """
+        key = self._get_key(chat_id, user_id, self.prefix, self.separator, bot_id=bot_id)
+        with self._lock:
+            record = self.data.get(key)
+            if record is None:
+                return False, []
+            items = record["data"].setdefault(field, [])
+            added = value not in items
+            if added:
+                items.append(value)
+            else:
+                items.remove(value)
+            return added, list(items)
+
+
+class RedisStateStorage(StateRedisStorage):
+    """Хранилище состояний в Redis, общее для всех экземпляров бота."""
+
+    def set_data_and_state(
+        self,
+        chat_id: int,
+        user_id: int,
+        state: State | str,
+        data: dict[str, Any],
+        bot_id: int | None = None,
+    ) -> bool:
+        """
+        Обновить данные и установить состояние одной транзакцией.
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+            state: Новое состояние
+            data: Поля для добавления в данные состояния
+            bot_id: ID бота
+
+        Returns:
+            True при успехе
+        """
+        if isinstance(state, State):
+            state = state.name
+
+        key = self._get_key(chat_id, user_id, self.prefix, self.separator, bot_id=bot_id)
+
+        def action(pipe):
+            raw = pipe.hget(key, "data")
+            merged = json.loads(raw) if raw else {}
+            merged.update(data)
+            pipe.multi()
+            pipe.hset(key, mapping={"state": state, "data": json.dumps(merged)})
+
+        self.redis.transaction(action, key)
+        return True
+
+    def toggle_data_item(
+        self,
+        chat_id: int,
+        user_id: int,
+        field: str,
+        value: Any,
+        bot_id: int | None = None,
+    ) -> tuple[bool, list[Any]]:
+        """
+        Добавить значение в список данных состояния или убрать его оттуда.
+
+        Чтение и запись выполняются в одной транзакции WATCH/MULTI/EXEC,
+        поэтому быстрые нажатия не теряют изменения друг друга.
+
+        Args:
+            chat_id: ID чата
+            user_id: ID пользователя
+            field: Поле со списком
+            value: Значение
+            bot_id: ID бота
+
+        Returns:
+            (True, если значение добавлено; список после изменения)
+        """
+        key = self._get_key(chat_id, user_id, self.prefix, self.separator, bot_id=bot_id)
+
+        def action(pipe):
+            # WATCH key: если другой экземпляр бота изменит данные между чтением
+            # и записью, транзакция повторится с новыми данными
+            raw = pipe.hget(key, "data")
+            if raw is None:
+                return False, []
+            data = json.loads(raw)
+            items = data.setdefault(field, [])
+            added = value not in items
+            if added:
+                items.append(value)
+            else:
+                items.remove(value)
+            pipe.multi()
+            pipe.hset(key, "data", json.dumps(data))
+            return added, items
+
+        return self.redis.transaction(action, key, value_from_callable=True)
@@ -2,68 +2,498 @@
 Утилиты для бота.
 """
 
-from collections.abc import Callable
+import asyncio
+import inspect
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
+from typing import Any
 
 from config import settings
 from loguru import logger
 from telebot import TeleBot
+from telebot.custom_filters import StateFilter
 from telebot.handler_backends import State
 from telebot.types import CallbackQuery, Message
+from telebot.util import content_type_media
 
+# Ограничивает число корутин обработчиков, одновременно обращающихся к API;
+# используется только в общем event loop
+_handler_semaphore = asyncio.Semaphore(settings.max_concurrent_handlers)
 
-def safe_handler(bot: TeleBot):
+# Общий event loop для async-кода обработчиков, работает в отдельном потоке
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+# Потоки для ответов на callback-запросы, не блокирующих обработчик
+_ack_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ack")
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Получить фоновый event loop, запустив его при первом обращении.
+
+    Returns:
+        Event loop, работающий в отдельном потоке
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-loop", daemon=True).start()
+    return _loop
+
+
+async def _run_bounded[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Выполнить корутину, заняв место в _handler_semaphore."""
+    async with _handler_semaphore:
+        return await coro
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Выполнить корутину в фоновом event loop и дождаться результата.
+
+    Используется в синхронных обработчиках вместо asyncio.run(), который
+    создаёт и закрывает новый event loop на каждый вызов. Нельзя вызывать
+    из кода, который уже выполняется в этом loop. Одновременно выполняется
+    не больше settings.max_concurrent_handlers корутин, остальные ждут
+    своей очереди в loop.
+
+    Args:
+        coro: Корутина
+
+    Returns:
+        Результат корутины
+    """
+    return asyncio.run_coroutine_threadsafe(_run_bounded(coro), get_event_loop()).result()
+
+
+class AsyncBot:
+    """
+    Обёртка над TeleBot для async-обработчиков.
+
+    Методы бота блокируют поток на время HTTP-запроса к Telegram (и ожидания
+    в send_limiter). Через обёртку они выполняются в пуле потоков, и event
+    loop продолжает обслуживать другие обработчики:
+    ``await AsyncBot(bot).send_message(chat_id, text)``.
+    """
+
+    __slots__ = ("_bot",)
+
+    def __init__(self, bot: TeleBot):
+        """
+        Args:
+            bot: Экземпляр TeleBot
+        """
+        self._bot = bot
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        method = getattr(self._bot, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+
+def _log_ack_error(future: Future):
+    """Залогировать ошибку фонового ответа на callback-запрос."""
+    if (e := future.exception()) is not None:
+        logger.warning("Не удалось ответить на callback-запрос: {}", e)
+
+
+def ack_callback(bot: TeleBot, callback_query_id: str, text: str | None = None):
     """
-    Декоратор для безопасной обработки ошибок в обработчиках.
+    Ответить на callback-запрос в фоне, не дожидаясь Telegram.
 
     Args:
         bot: Экземпляр TeleBot
+        callback_query_id: ID callback-запроса
+        text: Текст уведомления
+    """
+    future = _ack_executor.submit(bot.answer_callback_query, callback_query_id, text)
+    future.add_done_callback(_log_ack_error)
+
+
+_ERROR_TEXT = "❌ Произошла ошибка. Попробуйте ещё раз.\nЕсли ошибка повторяется — нажмите /cancel"
+
+# Лимит Telegram — 4096 символов; длинный текст ошибки обрезаем с запасом
+_MAX_ERROR_TEXT = 3500
+
+# settings.debug не меняется во время работы процесса, читаем его один раз
+_DEBUG = settings.debug
+
+
+def _report_error(bot: TeleBot, user_id: int, chat_id: int, error: Exception) -> None:
+    """Сообщить пользователю об ошибке обработчика."""
+    # Состояние читается из хранилища, только если DEBUG-запись кто-то примет
+    logger.opt(lazy=True).debug(
+        "Состояние пользователя при ошибке: user_id={}, chat_id={}, state={}",
+        lambda: user_id,
+        lambda: chat_id,
+        lambda: bot.get_state(user_id, chat_id),
+    )
+    if _DEBUG:
+        text = f"❌ Ошибка: {type(error).__name__}: {str(error)}"
+        bot.send_message(chat_id, text[:_MAX_ERROR_TEXT])
+    else:
+        bot.send_message(chat_id, _ERROR_TEXT)
+
+
+def _report_error_message(bot: TeleBot, message: Message, error: Exception) -> None:
+    _report_error(bot, message.from_user.id, message.chat.id, error)
+
+
+def _report_error_callback(bot: TeleBot, call: CallbackQuery, error: Exception) -> None:
+    # Обработчик мог уже ответить на запрос через ack_callback: повторный ответ
+    # Telegram отклонит, поэтому его ошибка только логируется в фоне
+    ack_callback(bot, call.id, "❌ Произошла ошибка")
+    _report_error(bot, call.from_user.id, call.message.chat.id, error)
+
+
+def _make_safe_decorator(bot: TeleBot, report: Callable[[TeleBot, Any, Exception], None]):
+    """
+    Создать декоратор, перехватывающий ошибки обработчика.
+
+    Args:
+        bot: Экземпляр TeleBot
+        report: Функция, сообщающая пользователю об ошибке
+
+    Returns:
+        Декоратор обработчика
     """
 
     def decorator(func: Callable):
+        is_coroutine = inspect.iscoroutinefunction(func)
+
         @wraps(func)
         def wrapper(update, *args, **kwargs):
             try:
+                if is_coroutine:
+                    return run_async(func(update, *args, **kwargs))
                 return func(update, *args, **kwargs)
             except Exception as e:
-                logger.error(f"Ошибка в {func.__name__}: {e}", exc_info=settings.debug)
-
-                error_text = (
-                    "❌ Произошла ошибка. Попробуйте ещё раз.\n"
-                    "Если ошибка повторяется — нажмите /cancel"
-                )
-
-                # Определяем тип обновления (Message или CallbackQuery)
-                if isinstance(update, Message):
-                    chat_id = update.chat.id
-                    current_state = bot.get_state(update.from_user.id, chat_id)
-                    logger.debug(
-                        f"Состояние пользователя при ошибке: user_id={update.from_user.id}, chat_id={chat_id}, state={current_state}",
-                    )
-                    if settings.debug:
-                        bot.send_message(chat_id, f"❌ Ошибка: {type(e).__name__}: {str(e)}")
-                    else:
-                        bot.send_message(chat_id, error_text)
-                elif isinstance(update, CallbackQuery):
-                    bot.answer_callback_query(update.id, "❌ Произошла ошибка")
-                    current_state = bot.get_state(update.from_user.id, update.message.chat.id)
-                    logger.debug(
-                        f"Состояние пользователя при ошибке: user_id={update.from_user.id}, chat_id={update.message.chat.id}, state={current_state}",
-                    )
-                    if settings.debug:
-                        bot.send_message(
-                            update.message.chat.id, f"❌ Ошибка: {type(e).__name__}: {str(e)}"
-                        )
-                    else:
-                        bot.send_message(update.message.chat.id, error_text)
+                logger.exception("Ошибка в {}: {}", func.__name__, e)
+                report(bot, update, e)
 
         return wrapper
 
     return decorator
 
 
-# Алиас для обратной совместимости
-safe_callback = safe_handler
+def safe_message_handler(bot: TeleBot):
+    """
+    Декоратор для безопасной обработки ошибок в message-обработчиках.
+
+    Обработчик может быть корутиной (async def): она выполняется в общем
+    event loop через run_async, который ограничивает число одновременно
+    выполняющихся корутин значением settings.max_concurrent_handlers.
+    Loop один на все чаты, поэтому в корутине вызовы Telegram и хранилища
+    состояний выполняются через AsyncBot и asyncio.to_thread.
+
+    Args:
+        bot: Экземпляр TeleBot
+    """
+    return _make_safe_decorator(bot, _report_error_message)
+
+
+def safe_callback_handler(bot: TeleBot):
+    """
+    Декоратор для безопасной обработки ошибок в callback-обработчиках.
+
+    Работает как safe_message_handler, но при ошибке дополнительно
+    отвечает на callback-запрос.
+
+    Args:
+        bot: Экземпляр TeleBot
+    """
+    return _make_safe_decorator(bot, _report_error_callback)
+
+
+# Алиасы для обратной совместимости: тип обновления известен в месте
+# регистрации, поэтому обёртка не проверяет его на каждом вызове
+safe_handler = safe_message_handler
+safe_callback = safe_callback_handler
+
+
+class TextRouter:
+    """
+    Маршрутизатор кнопок меню по тексту сообщения.
+
+    Вместо отдельного message_handler с func=lambda на каждую кнопку
+    в боте регистрируется один обработчик, который находит нужную
+    функцию поиском в словаре.
+    """
+
+    def __init__(self):
+        self._routes: dict[str, Callable[[Message], Any]] = {}
+
+    def route(self, text: str):
+        """
+        Декоратор: зарегистрировать обработчик для текста кнопки.
+
+        Args:
+            text: Текст кнопки
+        """
+
+        def decorator(func: Callable[[Message], Any]):
+            self._routes[text] = func
+            return func
+
+        return decorator
+
+    def register(self, bot: TeleBot) -> None:
+        """
+        Зарегистрировать общий обработчик кнопок в боте.
+
+        Маршруты можно добавлять и после регистрации.
+
+        Args:
+            bot: Экземпляр TeleBot
+        """
+        routes = self._routes
+
+        @bot.message_handler(func=lambda m: m.text in routes)
+        def dispatch_text(message: Message):
+            routes[message.text](message)
+
+
+# Общий маршрутизатор кнопок главного меню
+text_router = TextRouter()
+
+
+class CallbackRouter:
+    """
+    Маршрутизатор inline-кнопок по точному значению callback_data.
+
+    Заменяет callback_query_handler с func=lambda на каждую кнопку
+    одним обработчиком с поиском в словаре. Кнопки, которые зависят
+    от состояния или сравниваются по префиксу, остаются обычными
+    обработчиками.
+    """
+
+    def __init__(self):
+        self._routes: dict[str, Callable[[CallbackQuery], Any]] = {}
+
+    def route(self, data: str):
+        """
+        Декоратор: зарегистрировать обработчик для callback_data.
+
+        Args:
+            data: Значение callback_data
+        """
+
+        def decorator(func: Callable[[CallbackQuery], Any]):
+            self._routes[data] = func
+            return func
+
+        return decorator
+
+    def register(self, bot: TeleBot) -> None:
+        """
+        Зарегистрировать общий обработчик inline-кнопок в боте.
+
+        Маршруты можно добавлять и после регистрации.
+
+        Args:
+            bot: Экземпляр TeleBot
+        """
+        routes = self._routes
+
+        @bot.callback_query_handler(func=lambda call: call.data in routes)
+        def dispatch_callback(call: CallbackQuery):
+            routes[call.data](call)
+
+
+# Общий маршрутизатор inline-кнопок без состояния
+callback_router = CallbackRouter()
+
+
+class StateRouter:
+    """
+    Маршрутизатор сообщений по текущему FSM-состоянию пользователя.
+
+    Вместо отдельного фильтра на каждое состояние, которые telebot
+    проверяет по очереди, в боте регистрируется один обработчик:
+    он читает состояние один раз и находит шаг диалога в словаре.
+    Команды в состояние не передаются, их обрабатывают обработчики
+    команд (например, /cancel).
+    """
+
+    def __init__(self):
+        self._routes: dict[str, tuple[frozenset[str], Callable[[Message], Any]]] = {}
+
+    def route(self, state: State, content_types: tuple[str, ...] = ("text",)):
+        """
+        Декоратор: зарегистрировать обработчик шага для состояния.
+
+        Args:
+            state: Состояние, в котором вызывается обработчик
+            content_types: Принимаемые типы сообщений
+        """
+
+        def decorator(func: Callable[[Message], Any]):
+            self._routes[state.name] = (frozenset(content_types), func)
+            return func
+
+        return decorator
+
+    def register(self, bot: TeleBot) -> None:
+        """
+        Зарегистрировать общий обработчик состояний в боте.
+
+        Маршруты можно добавлять и после регистрации.
+
+        Args:
+            bot: Экземпляр TeleBot
+        """
+        routes = self._routes
+
+        def accepts(message: Message) -> bool:
+            text = message.text
+            if text and text[0] == "/":
+                return False
+            state = get_update_state(bot, message, message.from_user.id, message.chat.id)
+            route = routes.get(state)
+            return route is not None and message.content_type in route[0]
+
+        @bot.message_handler(func=accepts, content_types=content_type_media)
+        def dispatch_state(message: Message):
+            # Состояние уже прочитано в accepts для этого же обновления
+            state = get_update_state(bot, message, message.from_user.id, message.chat.id)
+            routes[state][1](message)
+
+
+# Общий маршрутизатор шагов диалогов
+state_router = StateRouter()
+
+
+def get_state_data(bot: TeleBot, user_id: int, chat_id: int) -> dict[str, Any]:
+    """
+    Прочитать данные состояния без записи обратно.
+
+    retrieve_data() сохраняет данные при выходе из блока, даже если они
+    не менялись; здесь выполняется только одно чтение из хранилища.
+    Возвращённый словарь нельзя изменять: для хранилища в памяти это
+    те же данные, что лежат в хранилище.
+
+    Args:
+        bot: Экземпляр TeleBot
+        user_id: ID пользователя
+        chat_id: ID чата
+
+    Returns:
+        Данные состояния (пустой словарь, если состояния нет)
+    """
+    return bot.current_states.get_data(chat_id, user_id, bot_id=bot.bot_id)
+
+
+def set_state_with_data(
+    bot: TeleBot,
+    user_id: int,
+    chat_id: int,
+    state: State,
+    /,
+    **data,
+) -> None:
+    """
+    Сохранить данные шага и перейти в следующее состояние.
+
+    Одна запись в хранилище вместо retrieve_data() + set_state().
+    Первые аргументы только позиционные, поэтому в data можно
+    передать и поле user_id.
+
+    Args:
+        bot: Экземпляр TeleBot
+        user_id: ID пользователя
+        chat_id: ID чата
+        state: Следующее состояние
+        **data: Поля для сохранения в данных состояния
+    """
+    bot.current_states.set_data_and_state(chat_id, user_id, state, data, bot_id=bot.bot_id)
+
+
+def toggle_state_item(
+    bot: TeleBot,
+    user_id: int,
+    chat_id: int,
+    field: str,
+    value: Any,
+) -> tuple[bool, list[Any]]:
+    """
+    Переключить наличие значения в списке данных состояния.
+
+    Args:
+        bot: Экземпляр TeleBot
+        user_id: ID пользователя
+        chat_id: ID чата
+        field: Поле со списком
+        value: Значение
+
+    Returns:
+        (True, если значение добавлено; список после изменения)
+    """
+    return bot.current_states.toggle_data_item(chat_id, user_id, field, value, bot_id=bot.bot_id)
+
+
+# Признак того, что состояние для обновления ещё не читалось
+_STATE_NOT_LOADED = object()
+
+
+def get_update_state(
+    bot: TeleBot,
+    update: Message | CallbackQuery,
+    user_id: int,
+    chat_id: int,
+) -> str | None:
+    """
+    Получить состояние пользователя, прочитав хранилище один раз за обновление.
+
+    Фильтры всех обработчиков проверяют один и тот же объект Message или
+    CallbackQuery в одном потоке, поэтому состояние сохраняется на нём.
+
+    Args:
+        bot: Экземпляр TeleBot
+        update: Обрабатываемое обновление
+        user_id: ID пользователя
+        chat_id: ID чата
+
+    Returns:
+        Имя состояния или None
+    """
+    state = getattr(update, "_cached_state", _STATE_NOT_LOADED)
+    if state is _STATE_NOT_LOADED:
+        state = bot.get_state(user_id, chat_id)
+        update._cached_state = state
+    return state
+
+
+class CachedStateFilter(StateFilter):
+    """
+    Фильтр state=... для обработчиков, читающий состояние через get_update_state.
+
+    Стандартный StateFilter обращается к хранилищу для каждого обработчика
+    с state=, поэтому одно обновление читало состояние многократно.
+    """
+
+    def check(self, update, text) -> bool:
+        if isinstance(update, Message) and update.from_user:
+            chat_id = update.chat.id
+        elif isinstance(update, CallbackQuery):
+            chat_id = update.message.chat.id if update.message else update.from_user.id
+        else:
+            return super().check(update, text)
+
+        state = get_update_state(self.bot, update, update.from_user.id, chat_id)
+        if isinstance(text, list):
+            return state in [i.name if isinstance(i, State) else i for i in text]
+        if isinstance(text, State):
+            text = text.name
+        if text == "*":
+            return state is not None
+        return state == text
 
 
 def check_state(
@@ -72,7 +502,7 @@ def check_state(
     chat_id: int,
     expected_state: State,
     skip_commands: bool = True,
-    message: Message | None = None,
+    update: Message | CallbackQuery | None = None,
 ) -> bool:
     """
     Проверка, находится ли пользователь в указанном состоянии.
@@ -83,15 +513,24 @@ def check_state(
         chat_id: ID чата
         expected_state: Ожидаемое состояние
         skip_commands: Игнорировать команды (сообщения, начинающиеся с /)
-        message: Объект сообщения (для проверки команд)
+        update: Обновление (для проверки команд и кеширования состояния)
 
     Returns:
         True если состояние совпадает
     """
-    if skip_commands and message and message.text and message.text.startswith("/"):
+    if (
+        skip_commands
+        and isinstance(update, Message)
+        and update.text
+        and update.text.startswith("/")
+    ):
         return False
-    current_state = bot.get_state(user_id, chat_id)
-    return current_state == expected_state or str(current_state) == str(expected_state)
+    if update is None:
+        current_state = bot.get_state(user_id, chat_id)
+    else:
+        current_state = get_update_state(bot, update, user_id, chat_id)
+    # Хранилище возвращает имя состояния ("Group:state"), а str(State) — "<Group:state>"
+    return current_state == expected_state.name
 
 
 def create_state_checker(
@@ -113,20 +552,33 @@ def create_state_checker(
         Функция для проверки состояния
     """
 
-    def checker(message: Message) -> bool:
-        types = allowed_content_types or {"text"}
+    # Имя ожидаемого состояния и набор типов не меняются, вычисляем их один раз
+    expected_name = expected_state.name
+    types = frozenset(allowed_content_types or ("text",))
+
+    # Настройки известны при регистрации, поэтому выбираем вариант проверки
+    # заранее, а не ветвимся по skip_commands на каждом сообщении
+    if not skip_commands:
+
+        def checker(message: Message) -> bool:
+            if message.content_type not in types:
+                return False
+            state = get_update_state(bot, message, message.from_user.id, message.chat.id)
+            return state == expected_name
+
+        return checker
+
+    def command_skipping_checker(message: Message) -> bool:
+        # Тип проверяем первым: для медиа не нужно читать .text
         if message.content_type not in types:
             return False
-        return check_state(
-            bot,
-            message.from_user.id,
-            message.chat.id,
-            expected_state,
-            skip_commands=skip_commands,
-            message=message,
-        )
+        text = message.text
+        if text and text[0] == "/":
+            return False
+        state = get_update_state(bot, message, message.from_user.id, message.chat.id)
+        return state == expected_name
 
-    return checker
+    return command_skipping_checker
 
 
 def create_callback_state_checker(
@@ -145,11 +597,22 @@ def create_callback_state_checker(
         Функция для проверки состояния
     """
 
+    expected_name = expected_state.name
+
+    def check(call: CallbackQuery) -> bool:
+        state = get_update_state(bot, call, call.from_user.id, call.message.chat.id)
+        return state == expected_name
+
+    if not data_prefix:
+        # Без префикса любые данные проходят, allowed_data ничего не меняет
+        return check
+
+    allowed = frozenset(allowed_data or ())
+
     def checker(call: CallbackQuery) -> bool:
-        if allowed_data and call.data in allowed_data:
-            return check_state(bot, call.from_user.id, call.message.chat.id, expected_state)
-        if data_prefix and (not call.data or not call.data.startswith(data_prefix)):
+        data = call.data
+        if not data or (data not in allowed and not data.startswith(data_prefix)):
             return False
-        return check_state(bot, call.from_user.id, call.message.chat.id, expected_state)
+        return check(call)
 
     return checker